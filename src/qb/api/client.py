@@ -1,8 +1,13 @@
 """QuickBooks Online API client with auto-refresh and structured errors."""
 
+import threading
+from importlib.util import find_spec
+
 import httpx
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
 
+from qb import cache
+from qb._json import dumps, loads
 from qb.auth.tokens import TokenManager, AuthNotConfiguredError
 
 SANDBOX_BASE = "https://sandbox-quickbooks.api.intuit.com"
@@ -10,6 +15,22 @@ PRODUCTION_BASE = "https://quickbooks.api.intuit.com"
 API_VERSION = "v3"
 MINOR_VERSION = "75"
 
+# QuickBooks accepts at most 30 items per BatchItemRequest
+BATCH_MAX_ITEMS = 30
+
+# QuickBooks caps MAXRESULTS at 1000 rows per query page
+QUERY_PAGE_MAX = 1000
+
+# Pool limits for the shared HTTP client (covers the thread-pool fan-outs)
+HTTP_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+
+# Multiplex concurrent requests over one connection when h2 is installed
+# (pip install "qb-cli[http2]")
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Fault code returned when a mutation carries an outdated SyncToken
+STALE_OBJECT_ERROR = "5010"
+
 
 class QBApiError(Exception):
     """Structured error from QuickBooks API."""
@@ -20,11 +41,13 @@ class QBApiError(Exception):
         message: str,
         detail: str = "",
         intuit_tid: str = "",
+        code: str = "",
     ):
         self.status_code = status_code
         self.message = message
         self.detail = detail
         self.intuit_tid = intuit_tid
+        self.code = code
         super().__init__(f"[{status_code}] {message}")
 
     @classmethod
@@ -32,7 +55,7 @@ class QBApiError(Exception):
         """Parse a QuickBooks error response."""
         intuit_tid = response.headers.get("intuit_tid", "")
         try:
-            body = response.json()
+            body = loads(response.content)
             fault = body.get("Fault", {})
             errors = fault.get("Error", [{}])
             error = errors[0] if errors else {}
@@ -41,6 +64,7 @@ class QBApiError(Exception):
                 message=error.get("Message", response.reason_phrase or "Unknown error"),
                 detail=error.get("Detail", ""),
                 intuit_tid=intuit_tid,
+                code=str(error.get("code", "")),
             )
         except Exception:
             return cls(
@@ -54,6 +78,7 @@ class QBClient:
     """HTTP client for QuickBooks Online API.
 
     Handles authentication, auto-refresh on 401, and URL construction.
+    Requests share one pooled httpx.Client so connections are reused.
     """
 
     def __init__(
@@ -69,6 +94,25 @@ class QBClient:
         self.client_secret = client_secret
         self._environment = environment
         self.verbose = verbose
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+
+    @property
+    def http(self) -> httpx.Client:
+        """Pooled HTTP client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        limits=HTTP_LIMITS, timeout=30.0, http2=HTTP2_AVAILABLE
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
 
     @property
     def base_url(self) -> str:
@@ -117,13 +161,12 @@ class QBClient:
             if params:
                 print(f"[HTTP] params={params}", file=sys.stderr)
 
-        response = httpx.request(
+        response = self.http.request(
             method,
             url,
             headers=self._headers(access_token),
             params=params,
-            json=json_body,
-            timeout=30.0,
+            content=dumps(json_body) if json_body is not None else None,
         )
 
         if self.verbose:
@@ -144,7 +187,7 @@ class QBClient:
         if not response.content:
             return {"success": True}
 
-        return response.json()
+        return loads(response.content)
 
     def get(self, path: str, params: Optional[dict] = None) -> dict:
         """HTTP GET request."""
@@ -156,11 +199,81 @@ class QBClient:
         body: Optional[dict] = None,
         params: Optional[dict] = None,
     ) -> dict:
-        """HTTP POST request."""
-        return self._request("POST", path, params=params, json_body=body)
+        """HTTP POST request. Clears the response cache, as writes can change any report."""
+        result = self._request("POST", path, params=params, json_body=body)
+        cache.clear(self)
+        return result
+
+    def post_with_sync_token(
+        self,
+        path: str,
+        entity: str,
+        entity_id: str,
+        body: Optional[dict] = None,
+        params: Optional[dict] = None,
+        sync_token: Optional[str] = None,
+    ) -> dict:
+        """POST a mutation without looking up the SyncToken first.
+
+        Sends ``sync_token`` (default "0", the token of a never-edited
+        entity); on a stale-object fault, fetches the current SyncToken and
+        retries once. The retry applies ``body`` over the latest version,
+        just as a lookup-then-POST would.
+        """
+        body = {**(body or {}), "Id": entity_id}
+        try:
+            return self.post(path, {**body, "SyncToken": sync_token or "0"}, params=params)
+        except QBApiError as e:
+            if e.code != STALE_OBJECT_ERROR:
+                raise
+        current = self.get(f"{path}/{entity_id}").get(entity, {})
+        return self.post(path, {**body, "SyncToken": current["SyncToken"]}, params=params)
 
     def query(self, sql: str, max_results: int = 100) -> dict:
         """Execute a QuickBooks query (SQL-like)."""
         if "MAXRESULTS" not in sql.upper():
             sql = f"{sql} MAXRESULTS {max_results}"
         return self.get("query", params={"query": sql})
+
+    def query_paginated(
+        self,
+        sql: str,
+        entity: str,
+        page_size: int = QUERY_PAGE_MAX,
+        limit: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """Yield rows of ``entity`` page by page via STARTPOSITION/MAXRESULTS.
+
+        ``sql`` must not contain STARTPOSITION or MAXRESULTS. Stops after a
+        short page, or once ``limit`` rows have been yielded.
+        """
+        page_size = min(page_size, QUERY_PAGE_MAX)
+        position = 1
+        while limit is None or position <= limit:
+            size = page_size if limit is None else min(page_size, limit - position + 1)
+            resp = self.get(
+                "query",
+                params={"query": f"{sql} STARTPOSITION {position} MAXRESULTS {size}"},
+            )
+            rows = resp.get("QueryResponse", {}).get(entity, [])
+            yield from rows
+            if len(rows) < size:
+                return
+            position += size
+
+    def batch(self, items: list[dict]) -> list[dict]:
+        """Execute BatchItemRequest items, chunked to the per-request limit.
+
+        Returns the BatchItemResponse entries; match them to requests by bId.
+        """
+        # Query-only batches are reads and leave the response cache alone
+        read_only = all("Query" in item for item in items)
+        responses = []
+        for start in range(0, len(items), BATCH_MAX_ITEMS):
+            body = {"BatchItemRequest": items[start:start + BATCH_MAX_ITEMS]}
+            if read_only:
+                resp = self._request("POST", "batch", json_body=body)
+            else:
+                resp = self.post("batch", body)
+            responses.extend(resp.get("BatchItemResponse", []))
+        return responses
@@ -1,5 +1,6 @@
 """Query builder helpers for QuickBooks SQL-like queries."""
 
+from typing import Iterable
 from urllib.parse import quote
 
 
@@ -46,3 +47,16 @@ def escape_query_value(value: str) -> str:
     escapes single quotes by doubling them.
     """
     return value.replace("'", "''")
+
+
+def select_fields(columns: Iterable[str]) -> str:
+    """Build a SELECT list of the top-level fields behind output columns.
+
+    Dotted columns select their parent object, since QuickBooks can
+    only project top-level properties.
+
+    Example:
+        >>> select_fields(["Id", "VendorRef.name", "TotalAmt"])
+        "Id, VendorRef, TotalAmt"
+    """
+    return ", ".join(dict.fromkeys(c.split(".", 1)[0] for c in columns))
@@ -2,6 +2,7 @@
 
 import json
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -29,6 +30,8 @@ class TokenManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.token_path = self.config_dir / TOKEN_FILE
         self._tokens: Optional[dict] = None
+        # Serializes refreshes when requests are issued from several threads
+        self._refresh_lock = threading.Lock()
 
     def save_tokens(
         self,
@@ -66,24 +69,25 @@ class TokenManager:
 
     def get_access_token(self, client_id: str, client_secret: str) -> str:
         """Get a valid access token, refreshing automatically if needed."""
-        tokens = self.load_tokens()
-
-        if time.time() >= tokens["expires_at"] - REFRESH_BUFFER_SECONDS:
-            # Token expired or about to expire — refresh
-            try:
-                new_tokens = refresh_access_token(
-                    client_id, client_secret, tokens["refresh_token"]
-                )
-                self.save_tokens(
-                    new_tokens, tokens["realm_id"], tokens["environment"]
-                )
-                tokens = self.load_tokens()
-            except OAuthError as e:
-                raise AuthNotConfiguredError(
-                    f"Token refresh failed: {e}. Run 'qb auth login' to re-authenticate."
-                )
-
-        return tokens["access_token"]
+        with self._refresh_lock:
+            tokens = self.load_tokens()
+
+            if time.time() >= tokens["expires_at"] - REFRESH_BUFFER_SECONDS:
+                # Token expired or about to expire — refresh
+                try:
+                    new_tokens = refresh_access_token(
+                        client_id, client_secret, tokens["refresh_token"]
+                    )
+                    self.save_tokens(
+                        new_tokens, tokens["realm_id"], tokens["environment"]
+                    )
+                    tokens = self.load_tokens()
+                except OAuthError as e:
+                    raise AuthNotConfiguredError(
+                        f"Token refresh failed: {e}. Run 'qb auth login' to re-authenticate."
+                    )
+
+            return tokens["access_token"]
 
     @property
     def realm_id(self) -> str:
@@ -0,0 +1,139 @@
+"""On-disk cache for read-only API responses.
+
+Entries live under ``<config dir>/cache`` and are keyed by environment,
+company and request, so they never leak across companies. Any write made
+through QBClient clears the cache. Report TTLs come from
+QB_REPORT_CACHE_TTL and query TTLs from QB_QUERY_CACHE_TTL.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from qb._json import dumps, loads
+
+DEFAULT_TTL = 300
+
+
+def ttl_from_env(var: str, default: float = DEFAULT_TTL) -> float:
+    """Read a TTL in seconds from an environment variable (0 disables)."""
+    try:
+        return float(os.environ.get(var, default))
+    except ValueError:
+        return default
+
+
+def cache_dir(client) -> Path:
+    """Cache directory for a client's config dir."""
+    return client.token_manager.config_dir / "cache"
+
+
+def _entry_path(client, namespace: str, key: str) -> Path:
+    digest = hashlib.sha1(
+        f"{client.base_url}|{client.realm_id}|{namespace}|{key}".encode()
+    ).hexdigest()
+    return cache_dir(client) / f"{namespace}_{digest}.json"
+
+
+def get(client, namespace: str, key: str, ttl: float) -> Optional[Any]:
+    """Return a cached value younger than ``ttl`` seconds, else None."""
+    if ttl <= 0:
+        return None
+    path = _entry_path(client, namespace, key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def put(client, namespace: str, key: str, value: Any) -> None:
+    """Store a value; failures are ignored (the cache is best-effort).
+
+    Entries hold company financial data, so the directory is created 0700
+    and each entry written 0600 (mkstemp's mode) via a unique temp file,
+    which keeps concurrent writers of the same key from clobbering each
+    other before the atomic rename.
+    """
+    path = _entry_path(client, namespace, key)
+    tmp = None
+    try:
+        payload = dumps(value)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except (OSError, TypeError):
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def clear(client) -> None:
+    """Drop every cached entry."""
+    shutil.rmtree(cache_dir(client), ignore_errors=True)
+
+
+def _cached(client, namespace: str, key: str, ttl: float, use_cache: bool, fetch: Callable[[], Any]) -> Any:
+    """Return a fresh cached value or fetch and store it.
+
+    ``use_cache=False`` skips the lookup but still refreshes the entry.
+    """
+    value = get(client, namespace, key, ttl) if use_cache else None
+    if value is None:
+        value = fetch()
+        if ttl > 0:
+            put(client, namespace, key, value)
+    return value
+
+
+def cached_report(client, report_name: str, params: dict, use_cache: bool = True) -> dict:
+    """GET reports/<report_name>, cached for QB_REPORT_CACHE_TTL seconds."""
+    return _cached(
+        client, "report", f"{report_name}|{sorted(params.items())}",
+        ttl_from_env("QB_REPORT_CACHE_TTL"), use_cache,
+        lambda: client.get(f"reports/{report_name}", params=params),
+    )
+
+
+def cached_get(client, path: str, use_cache: bool = True) -> dict:
+    """GET an entity path (e.g. ``account/35``), cached for QB_QUERY_CACHE_TTL seconds."""
+    return _cached(
+        client, "get", path,
+        ttl_from_env("QB_QUERY_CACHE_TTL"), use_cache,
+        lambda: client.get(path),
+    )
+
+
+def cached_query(client, sql: str, max_results: int = 100, use_cache: bool = True) -> dict:
+    """client.query, cached for QB_QUERY_CACHE_TTL seconds."""
+    return _cached(
+        client, "query", f"{sql}|{max_results}",
+        ttl_from_env("QB_QUERY_CACHE_TTL"), use_cache,
+        lambda: client.query(sql, max_results=max_results),
+    )
+
+
+def cached_query_paginated(
+    client,
+    sql: str,
+    entity: str,
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+) -> Iterable[dict]:
+    """All rows of client.query_paginated, cached for QB_QUERY_CACHE_TTL seconds.
+
+    With caching disabled the rows are streamed page by page instead.
+    """
+    ttl = ttl_from_env("QB_QUERY_CACHE_TTL")
+    if ttl <= 0:
+        return client.query_paginated(sql, entity, limit=limit)
+    return _cached(
+        client, "query", f"{sql}|{entity}|{limit}", ttl, use_cache,
+        lambda: list(client.query_paginated(sql, entity, limit=limit)),
+    )
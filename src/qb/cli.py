@@ -186,6 +186,7 @@ def main(
             environment=environment,
             verbose=verbose,
         )
+        ctx.call_on_close(_client.close)
     except AuthNotConfiguredError as e:
         handle_error(ExitCode.AUTH_ERROR, str(e), hint="qb auth login")
 
@@ -3,7 +3,9 @@
 import csv as csv_mod
 import io
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -84,8 +86,29 @@ def _detect_format(file_path: str) -> str:
     return "csv"
 
 
-def _match_transactions(imported: list[dict], existing: list[dict], tolerance_days: int = 3) -> dict:
-    """Match imported transactions against existing QB transactions.
+def _parse_day(value: Optional[str]) -> Optional[int]:
+    """Return the day ordinal of a YYYY-MM-DD date prefix, or None if invalid."""
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").toordinal()
+    except (ValueError, TypeError):
+        return None
+
+
+def _index_transactions(existing: list[dict]) -> dict[int, list[tuple]]:
+    """Index existing QB transactions by absolute amount in cents.
+
+    Entries are (position, day ordinal or None, transaction); the position
+    preserves the original order for tie-breaking during matching.
+    """
+    index: dict[int, list[tuple]] = defaultdict(list)
+    for pos, ex in enumerate(existing):
+        ex_amt = abs(float(ex.get("TotalAmt", ex.get("Amount", 0))))
+        index[round(ex_amt * 100)].append((pos, _parse_day(ex.get("TxnDate", "")), ex))
+    return index
+
+
+def _match_transactions_indexed(imported: list[dict], index: dict[int, list[tuple]], tolerance_days: int = 3) -> dict:
+    """Match imported transactions against an index from _index_transactions.
 
     Returns dict with 'matched', 'probable', 'unmatched' lists.
     """
@@ -94,48 +117,49 @@ def _match_transactions(imported: list[dict], existing: list[dict], tolerance_da
     unmatched = []
 
     for imp in imported:
-        imp_amt = imp["amount"]
-        imp_date = imp["date"]
+        imp_amt = abs(imp["amount"])
+        imp_day = _parse_day(imp["date"])
         imp_fitid = imp.get("fitid", "")
         imp_check = imp.get("check_number", "")
 
+        # Amounts within a cent of each other can round up to two cents apart
+        cents = round(imp_amt * 100)
+        candidates = sorted(
+            (entry for key in range(cents - 2, cents + 3) for entry in index.get(key, ())),
+            key=itemgetter(0),
+        )
+
         best_match = None
+        best_days = 0
         match_type = None
 
-        for ex in existing:
-            ex_amt = float(ex.get("TotalAmt", ex.get("Amount", 0)))
+        for _, ex_day, ex in candidates:
             # QB stores positive amounts; debits are negative in import
-            # Normalize: for purchases/expenses, QB amount is positive, import is negative
-            ex_date = ex.get("TxnDate", "")
-            ex_doc = ex.get("DocNumber", "")
-
-            # Check amount match (exact)
-            if abs(abs(imp_amt) - abs(ex_amt)) > 0.01:
+            ex_amt = float(ex.get("TotalAmt", ex.get("Amount", 0)))
+            if abs(imp_amt - abs(ex_amt)) > 0.01:
                 continue
 
             # Check date proximity
-            try:
-                d_imp = datetime.strptime(imp_date[:10], "%Y-%m-%d")
-                d_ex = datetime.strptime(ex_date[:10], "%Y-%m-%d")
-                days_diff = abs((d_imp - d_ex).days)
-            except (ValueError, TypeError):
+            if imp_day is None or ex_day is None:
                 days_diff = 999
-
+            else:
+                days_diff = abs(imp_day - ex_day)
             if days_diff > tolerance_days:
                 continue
 
             # Exact match: amount + date + (FITID or check number)
             if days_diff == 0 and (
                 (imp_fitid and imp_fitid == ex.get("_fitid", ""))
-                or (imp_check and imp_check == ex_doc)
+                or (imp_check and imp_check == ex.get("DocNumber", ""))
             ):
                 best_match = ex
                 match_type = "exact"
                 break
 
-            # Probable match: amount + date within tolerance
-            if best_match is None or days_diff < abs((datetime.strptime(imp_date[:10], "%Y-%m-%d") - datetime.strptime(best_match.get("TxnDate", "1900-01-01")[:10], "%Y-%m-%d")).days):
+            # Probable match: amount + closest date within tolerance
+            if best_match is None or days_diff < best_days:
                 best_match = ex
+                best_days = days_diff
                 match_type = "probable"
 
         if match_type == "exact":
@@ -148,6 +172,14 @@ def _match_transactions(imported: list[dict], existing: list[dict], tolerance_da
     return {"matched": matched, "probable": probable, "unmatched": unmatched}
 
 
+def _match_transactions(imported: list[dict], existing: list[dict], tolerance_days: int = 3) -> dict:
+    """Match imported transactions against existing QB transactions.
+
+    Returns dict with 'matched', 'probable', 'unmatched' lists.
+    """
+    return _match_transactions_indexed(imported, _index_transactions(existing), tolerance_days)
+
+
 @app.command()
 def preview(
     file_path: Annotated[str, typer.Argument(help="Path to bank statement file")],
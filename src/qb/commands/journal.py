@@ -5,6 +5,7 @@ from typing import Annotated, Optional
 
 import typer
 
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks journal entries.")
@@ -79,14 +80,7 @@ def create(
         total_debit = sum(l["amount"] for l in parsed if l.get("type", "").lower() == "debit")
         total_credit = sum(l["amount"] for l in parsed if l.get("type", "").lower() == "credit")
         if abs(total_debit - total_credit) > 0.01:
-            typer.echo(
-                json.dumps({
-                    "error": True,
-                    "message": f"Debits ({total_debit}) must equal credits ({total_credit})",
-                }),
-                err=True,
-            )
-            raise SystemExit(5)
+            handle_error_fast(f"Debits ({total_debit}) must equal credits ({total_credit})")
 
         qb_lines = []
         for l in parsed:
@@ -114,11 +108,7 @@ def create(
 
         body = {"Line": qb_lines}
     else:
-        typer.echo(
-            json.dumps({"error": True, "message": "Provide --lines or --json"}),
-            err=True,
-        )
-        raise SystemExit(5)
+        handle_error_fast("Provide --lines or --json")
 
     if txn_date:
         body["TxnDate"] = txn_date
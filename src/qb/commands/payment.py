@@ -5,6 +5,7 @@ from typing import Annotated, Optional
 
 import typer
 
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks payments.")
@@ -110,11 +111,7 @@ def create(
             if invoice_amounts:
                 amounts = [float(a.strip()) for a in invoice_amounts.split(",")]
                 if len(amounts) != len(ids):
-                    typer.echo(
-                        json.dumps({"error": True, "message": "--invoice-amounts count must match --invoice-ids count"}),
-                        err=True,
-                    )
-                    raise SystemExit(5)
+                    handle_error_fast("--invoice-amounts count must match --invoice-ids count")
 
             lines = []
             for i, inv_id in enumerate(ids):
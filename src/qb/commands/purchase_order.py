@@ -1,14 +1,18 @@
 """PurchaseOrder resource commands."""
 
-import json
 from typing import Annotated, Optional
 
 import typer
 
+from qb._json import loads
+from qb.api.query import escape_query_value, select_fields
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks purchase orders.")
 
+_PO_COLUMNS = ["Id", "DocNumber", "VendorRef.name", "TotalAmt", "POStatus", "TxnDate"]
+
 
 def _client():
     from qb.cli import get_client
@@ -28,12 +32,13 @@ def list_pos(
     """List all purchase orders."""
     fmt = output or _output()
     client = _client()
-    result = client.query("SELECT * FROM PurchaseOrder", max_results=limit)
-    pos = result.get("QueryResponse", {}).get("PurchaseOrder", [])
+    # Table/CSV only render _PO_COLUMNS, so only fetch those fields
+    select = "*" if fmt == OutputFormat.json else select_fields(_PO_COLUMNS)
+    pos = client.query_paginated(f"SELECT {select} FROM PurchaseOrder", "PurchaseOrder", limit=limit)
     format_output(
         pos,
         fmt,
-        columns=["Id", "DocNumber", "VendorRef.name", "TotalAmt", "POStatus", "TxnDate"],
+        columns=_PO_COLUMNS,
     )
 
 
@@ -66,11 +71,11 @@ def create(
     client = _client()
 
     if json_input:
-        body = json.loads(json_input)
+        body = loads(json_input)
     elif line_json:
         body = {
             "VendorRef": {"value": vendor_id},
-            "Line": json.loads(line_json),
+            "Line": loads(line_json),
         }
     elif amount is not None:
         if item_id:
@@ -86,21 +91,13 @@ def create(
             }
         else:
             # No item specified — error out since PO requires ItemRef
-            typer.echo(
-                json.dumps({"error": True, "message": "--item-id is required for PO line items (use --line-json for custom lines)"}),
-                err=True,
-            )
-            raise SystemExit(5)
+            handle_error_fast("--item-id is required for PO line items (use --line-json for custom lines)")
         body = {
             "VendorRef": {"value": vendor_id},
             "Line": [line],
         }
     else:
-        typer.echo(
-            json.dumps({"error": True, "message": "Provide --amount, --line-json, or --json"}),
-            err=True,
-        )
-        raise SystemExit(5)
+        handle_error_fast("Provide --amount, --line-json, or --json")
 
     if txn_date:
         body["TxnDate"] = txn_date
@@ -117,16 +114,19 @@ def create(
 def update(
     po_id: Annotated[str, typer.Argument(help="PurchaseOrder ID")],
     json_input: Annotated[str, typer.Option("--json", help="Fields to update as JSON")] = "{}",
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="Current SyncToken (skips the lookup request)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
-    """Update a purchase order. Auto-fetches SyncToken."""
+    """Update a purchase order. Auto-fetches SyncToken unless --sync-token is given."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"purchaseorder/{po_id}").get("PurchaseOrder", {})
-    body = json.loads(json_input)
-    body["Id"] = current["Id"]
-    body["SyncToken"] = current["SyncToken"]
+    if sync_token is None:
+        current = client.get(f"purchaseorder/{po_id}").get("PurchaseOrder", {})
+        sync_token = current["SyncToken"]
+    body = loads(json_input)
+    body["Id"] = po_id
+    body["SyncToken"] = sync_token
     body.setdefault("sparse", True)
 
     result = client.post("purchaseorder", body)
@@ -136,15 +136,16 @@ def update(
 @app.command()
 def delete(
     po_id: Annotated[str, typer.Argument(help="PurchaseOrder ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Delete a purchase order."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"purchaseorder/{po_id}").get("PurchaseOrder", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"]}
-    result = client.post("purchaseorder", body, params={"operation": "delete"})
+    result = client.post_with_sync_token(
+        "purchaseorder", "PurchaseOrder", po_id, params={"operation": "delete"}, sync_token=sync_token
+    )
     format_output(result, fmt)
 
 
@@ -166,17 +167,8 @@ def send(
     format_output(result.get("PurchaseOrder", result), fmt)
 
 
-@app.command("to-bill")
-def to_bill(
-    po_id: Annotated[str, typer.Argument(help="PurchaseOrder ID to convert")],
-    output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
-):
-    """Convert a purchase order to a bill (upon receiving goods)."""
-    fmt = output or _output()
-    client = _client()
-
-    po = client.get(f"purchaseorder/{po_id}").get("PurchaseOrder", {})
-
+def _bill_from_po(po_id: str, po: dict) -> dict:
+    """Build a Bill body linked to a purchase order."""
     body = {
         "VendorRef": po["VendorRef"],
         "Line": po.get("Line", []),
@@ -186,8 +178,72 @@ def to_bill(
     for field in ("DueDate", "APAccountRef", "SalesTermRef"):
         if field in po:
             body[field] = po[field]
+    return body
+
+
+def _to_bills(client, po_ids: list[str]) -> list[dict]:
+    """Convert several POs with one query and batched Bill creates."""
+    in_list = ", ".join(f"'{escape_query_value(po_id)}'" for po_id in po_ids)
+    pos = {
+        po["Id"]: po
+        for po in client.query_paginated(
+            f"SELECT * FROM PurchaseOrder WHERE Id IN ({in_list})", "PurchaseOrder"
+        )
+    }
+    responses = {
+        resp.get("bId"): resp
+        for resp in client.batch([
+            {"bId": po_id, "operation": "create", "Bill": _bill_from_po(po_id, pos[po_id])}
+            for po_id in po_ids if po_id in pos
+        ])
+    }
+
+    results = []
+    for po_id in po_ids:
+        resp = responses.get(po_id, {})
+        bill = resp.get("Bill")
+        if po_id not in pos:
+            error = "PurchaseOrder not found"
+        elif bill is None:
+            errors = resp.get("Fault", {}).get("Error") or [{}]
+            error = errors[0].get("Message", "Bill create failed")
+        else:
+            error = ""
+        results.append({
+            "po_id": po_id,
+            "bill_id": bill.get("Id") if bill else None,
+            "total": bill.get("TotalAmt") if bill else None,
+            "error": error,
+        })
+    return results
+
+
+@app.command("to-bill")
+def to_bill(
+    po_id: Annotated[Optional[str], typer.Argument(help="PurchaseOrder ID to convert")] = None,
+    ids: Annotated[Optional[str], typer.Option("--ids", help="Comma-separated PO IDs to convert in one batch")] = None,
+    output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
+):
+    """Convert a purchase order to a bill (upon receiving goods).
+
+    With --ids, converts several POs using one query and batched creates.
+    """
+    fmt = output or _output()
+    client = _client()
+
+    if ids:
+        po_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+        results = _to_bills(client, po_ids)
+        format_output(results, fmt, columns=["po_id", "bill_id", "total", "error"])
+        if any(r["error"] for r in results):
+            raise SystemExit(1)
+        return
+    if not po_id:
+        handle_error_fast("Provide a PO ID or --ids")
+
+    po = client.get(f"purchaseorder/{po_id}").get("PurchaseOrder", {})
 
-    result = client.post("bill", body)
+    result = client.post("bill", _bill_from_po(po_id, po))
     format_output(result.get("Bill"), fmt)
 
 
@@ -201,12 +257,13 @@ def query(
     client = _client()
 
     if not sql.upper().startswith("SELECT"):
-        sql = f"SELECT * FROM PurchaseOrder WHERE {sql}"
+        select = "*" if fmt == OutputFormat.json else select_fields(_PO_COLUMNS)
+        sql = f"SELECT {select} FROM PurchaseOrder WHERE {sql}"
 
     result = client.query(sql)
     pos = result.get("QueryResponse", {}).get("PurchaseOrder", [])
     format_output(
         pos,
         fmt,
-        columns=["Id", "DocNumber", "VendorRef.name", "TotalAmt", "POStatus", "TxnDate"],
+        columns=_PO_COLUMNS,
     )
@@ -1,18 +1,40 @@
 """Bank reconciliation helper commands."""
 
+import glob
+import hashlib
 import json
-from datetime import datetime
+import os
 from pathlib import Path
 from typing import Annotated, Optional
 
 import typer
 
+from qb import cache
+from qb._json import dumps, loads
+from qb.api.client import QBApiError, QUERY_PAGE_MAX
 from qb.output import format_output, format_report, OutputFormat
 
 app = typer.Typer(help="Bank reconciliation helpers.")
 
 WORKSPACE = Path("/workspace")
 
+_SESSION_NAME = "reconcile_{account_id}_{suffix}.json"
+
+# Number of uncleared transactions shown by reconcile start
+RECENT_TXN_LIMIT = 20
+
+# Fields reconcile reads from each transaction entity. Transfer carries
+# Amount instead of TotalAmt; only Payment and SalesReceipt have PaymentRefNum.
+_TXN_FIELDS = {
+    "Purchase": "Id, TxnDate, TotalAmt, DocNumber, PrivateNote",
+    "Deposit": "Id, TxnDate, TotalAmt, PrivateNote",
+    "Transfer": "Id, TxnDate, Amount, PrivateNote",
+    "Payment": "Id, TxnDate, TotalAmt, PaymentRefNum, PrivateNote",
+    "SalesReceipt": "Id, TxnDate, TotalAmt, DocNumber, PaymentRefNum, PrivateNote",
+    "BillPayment": "Id, TxnDate, TotalAmt, DocNumber, PrivateNote",
+    "JournalEntry": "Id, TxnDate, TotalAmt, DocNumber, PrivateNote",
+}
+
 
 def _client():
     from qb.cli import get_client
@@ -24,6 +46,140 @@ def _output():
     return get_output_format()
 
 
+def _session_path(account_id: str, statement_date: str) -> str:
+    """Return the session file path for an account and statement date."""
+    return os.path.join(WORKSPACE, _SESSION_NAME.format(account_id=account_id, suffix=statement_date))
+
+
+def _session_files(account_id: str) -> list[str]:
+    """Return an account's session files, newest statement date first."""
+    pattern = os.path.join(glob.escape(os.fspath(WORKSPACE)), _SESSION_NAME.format(account_id=account_id, suffix="*"))
+    return sorted(glob.glob(pattern), reverse=True)
+
+
+def _query_entities(
+    client,
+    queries: dict[str, str],
+    limit: Optional[int] = None,
+) -> dict[str, list[dict]]:
+    """Run one query per entity, in batch requests when possible.
+
+    ``queries`` maps entity name to a query without STARTPOSITION or
+    MAXRESULTS. Entities whose page comes back full are paged in follow-up
+    batches until exhausted or ``limit`` rows were read. If the batch request
+    itself is rejected, the queries are issued concurrently instead.
+    Returns rows keyed by entity; entities whose query failed are omitted.
+    """
+    rows: dict[str, list[dict]] = {entity: [] for entity in queries}
+    pending = dict.fromkeys(queries, 1)  # entity -> next STARTPOSITION
+    while pending:
+        sizes = {}
+        items = []
+        for entity, position in pending.items():
+            size = QUERY_PAGE_MAX
+            if limit is not None:
+                size = min(size, limit - len(rows[entity]))
+            sizes[entity] = size
+            items.append({
+                "bId": entity,
+                "Query": f"{queries[entity]} STARTPOSITION {position} MAXRESULTS {size}",
+            })
+        try:
+            responses = client.batch(items)
+        except QBApiError:
+            return _query_entities_parallel(client, queries, limit)
+
+        next_pending = {}
+        for resp in responses:
+            entity = resp.get("bId")
+            if entity not in pending or entity not in rows:
+                continue
+            if "Fault" in resp:
+                del rows[entity]
+                continue
+            page = resp.get("QueryResponse", {}).get(entity, [])
+            rows[entity].extend(page)
+            if len(page) == sizes[entity] and (limit is None or len(rows[entity]) < limit):
+                next_pending[entity] = pending[entity] + len(page)
+        pending = next_pending
+    return rows
+
+
+def _query_entities_parallel(
+    client,
+    queries: dict[str, str],
+    limit: Optional[int] = None,
+) -> dict[str, list[dict]]:
+    """Issue per-entity queries on a thread pool (fallback for _query_entities)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _fetch(entity: str) -> tuple[str, Optional[list[dict]]]:
+        try:
+            return entity, list(client.query_paginated(queries[entity], entity, limit=limit))
+        except Exception:
+            return entity, None
+
+    with ThreadPoolExecutor(max_workers=len(queries) or 1) as pool:
+        results = pool.map(_fetch, queries)
+    return {entity: items for entity, items in results if items is not None}
+
+
+def _fetch_txns(
+    client,
+    entities: list[str],
+    where: str,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Query each entity with the same WHERE clause.
+
+    Returns the rows of all entities in ``entities`` order, each tagged
+    with ``_entity_type``.
+    """
+    rows = _query_entities(client, {
+        entity: f"SELECT {_TXN_FIELDS[entity]} FROM {entity} WHERE {where}"
+        for entity in entities
+    }, limit=limit)
+    txns = []
+    for entity in entities:
+        for item in rows.get(entity, []):
+            item["_entity_type"] = entity
+            txns.append(item)
+    return txns
+
+
+def _load_statement(statement_file: str) -> list[dict]:
+    """Parse a statement file, caching the result under WORKSPACE/.cache.
+
+    The cache key covers path, mtime and size, so editing the file forces
+    a reparse.
+    """
+    from qb.commands.import_cmd import _detect_format, _parse_ofx, _parse_csv
+
+    st = os.stat(statement_file)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(statement_file)}|{st.st_mtime_ns}|{st.st_size}".encode()
+    ).hexdigest()[:16]
+    cache_file = WORKSPACE / ".cache" / f"stmt_{key}.json"
+    try:
+        with open(cache_file, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        pass
+
+    if _detect_format(statement_file) == "ofx":
+        txns = _parse_ofx(statement_file)
+    else:
+        txns = _parse_csv(statement_file, "Date", "Amount", "Description", False)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "wb") as f:
+            f.write(dumps(txns))
+    except OSError:
+        pass
+    return txns
+
+
 @app.command()
 def start(
     account_id: Annotated[str, typer.Option("--account-id", help="Bank/CC account ID")],
@@ -36,33 +192,34 @@ def start(
     Queries uncleared transactions and calculates the difference
     between QB and the bank statement.
     """
+    from datetime import datetime
+
     fmt = output or _output()
     client = _client()
 
     # Get account info
-    acct = client.get(f"account/{account_id}").get("Account", {})
+    # Always fetch fresh, but store it so 'reconcile report' can reuse it
+    acct = cache.cached_get(client, f"account/{account_id}", use_cache=False).get("Account", {})
     acct_name = acct.get("Name", f"Account {account_id}")
     qb_balance = float(acct.get("CurrentBalance", 0))
 
     # Query all transactions for this account up to statement date
     # We query various transaction types that affect this account
-    uncleared = []
-    for entity in ["Purchase", "Deposit", "Transfer", "Payment", "SalesReceipt", "BillPayment"]:
-        try:
-            sql = f"SELECT * FROM {entity} WHERE TxnDate <= '{statement_date}'"
-            resp = client.query(sql, max_results=1000)
-            for item in resp.get("QueryResponse", {}).get(entity, []):
-                uncleared.append({
-                    "type": entity,
-                    "id": item.get("Id"),
-                    "date": item.get("TxnDate"),
-                    "amount": float(item.get("TotalAmt", item.get("Amount", 0))),
-                    "doc_number": item.get("DocNumber", ""),
-                    "memo": item.get("PrivateNote", ""),
-                    "ref": item.get("PaymentRefNum", item.get("DocNumber", "")),
-                })
-        except Exception:
-            continue
+    entities = ["Purchase", "Deposit", "Transfer", "Payment", "SalesReceipt", "BillPayment"]
+    txns = _fetch_txns(client, entities, f"TxnDate <= '{statement_date}'", limit=1000)
+    # Only the first few rows are rendered; the rest are just counted
+    recent = []
+    for item in txns[:RECENT_TXN_LIMIT]:
+        get = item.get
+        recent.append({
+            "type": get("_entity_type"),
+            "id": get("Id"),
+            "date": get("TxnDate"),
+            "amount": float(get("TotalAmt", get("Amount", 0))),
+            "doc_number": get("DocNumber", ""),
+            "memo": get("PrivateNote", ""),
+            "ref": get("PaymentRefNum", get("DocNumber", "")),
+        })
 
     difference = round(statement_balance - qb_balance, 2)
 
@@ -74,20 +231,20 @@ def start(
         "qb_balance": qb_balance,
         "difference": difference,
         "status": "balanced" if abs(difference) < 0.01 else "unbalanced",
-        "transaction_count": len(uncleared),
+        "transaction_count": len(txns),
         "started_at": datetime.now().isoformat(),
     }
 
     # Save session state
     WORKSPACE.mkdir(parents=True, exist_ok=True)
-    session_file = WORKSPACE / f"reconcile_{account_id}_{statement_date}.json"
-    with open(session_file, "w") as f:
-        json.dump(session, f, indent=2)
+    session_file = _session_path(account_id, statement_date)
+    with open(session_file, "wb") as f:
+        f.write(dumps(session, indent=True))
 
     result = {
         **session,
-        "session_file": str(session_file),
-        "recent_transactions": uncleared[:20],
+        "session_file": session_file,
+        "recent_transactions": recent,
     }
 
     format_output(result, fmt)
@@ -102,13 +259,13 @@ def status(
     fmt = output or _output()
 
     # Find most recent session file
-    sessions = sorted(WORKSPACE.glob(f"reconcile_{account_id}_*.json"), reverse=True)
+    sessions = _session_files(account_id)
     if not sessions:
         typer.echo(json.dumps({"status": "none", "message": f"No reconciliation in progress for account {account_id}"}))
         return
 
-    with open(sessions[0]) as f:
-        session = json.load(f)
+    with open(sessions[0], "rb") as f:
+        session = loads(f.read())
 
     format_output(session, fmt)
 
@@ -128,54 +285,52 @@ def match(
     fmt = output or _output()
     client = _client()
 
-    # Parse statement
-    from qb.commands.import_cmd import _detect_format, _parse_ofx, _parse_csv
-    detected = _detect_format(statement_file)
-    if detected == "ofx":
-        stmt_txns = _parse_ofx(statement_file)
-    else:
-        stmt_txns = _parse_csv(statement_file, "Date", "Amount", "Description", False)
+    # Parse statement (reused from the cache while the file is unchanged)
+    stmt_txns = _load_statement(statement_file)
 
     if not stmt_txns:
         typer.echo(json.dumps({"status": "empty", "message": "No transactions in statement file"}))
         return
 
     # Get date range
-    dates = [t["date"][:10] for t in stmt_txns if t["date"]]
-    min_date = min(dates)
-    max_date = max(dates)
+    dates = (t["date"][:10] for t in stmt_txns if t.get("date"))
+    min_date = max_date = next(dates, None)
+    if min_date is None:
+        typer.echo(json.dumps({"status": "empty", "message": "No dated transactions in statement file"}))
+        return
+    for d in dates:
+        if d < min_date:
+            min_date = d
+        elif d > max_date:
+            max_date = d
 
     # Query QB transactions
-    qb_txns = []
-    for entity in ["Purchase", "Deposit", "Transfer", "Payment", "SalesReceipt", "JournalEntry"]:
-        try:
-            sql = f"SELECT * FROM {entity} WHERE TxnDate >= '{min_date}' AND TxnDate <= '{max_date}'"
-            resp = client.query(sql, max_results=500)
-            for item in resp.get("QueryResponse", {}).get(entity, []):
-                item["_entity_type"] = entity
-                qb_txns.append(item)
-        except Exception:
-            continue
+    entities = ["Purchase", "Deposit", "Transfer", "Payment", "SalesReceipt", "JournalEntry"]
+    qb_txns = _fetch_txns(client, entities, f"TxnDate >= '{min_date}' AND TxnDate <= '{max_date}'")
 
-    # Match
-    from qb.commands.import_cmd import _match_transactions
-    result = _match_transactions(stmt_txns, qb_txns, tolerance)
+    # Match against QB transactions indexed by amount
+    from qb.commands.import_cmd import _index_transactions, _match_transactions_indexed
+    result = _match_transactions_indexed(stmt_txns, _index_transactions(qb_txns), tolerance)
 
     # Find QB transactions not on statement
-    matched_qb_ids = set()
-    for m in result["matched"] + result["probable"]:
-        matched_qb_ids.add(m["existing"].get("Id"))
-
-    outstanding_in_qb = [
-        {
-            "type": t.get("_entity_type"),
-            "id": t.get("Id"),
-            "date": t.get("TxnDate"),
-            "amount": float(t.get("TotalAmt", t.get("Amount", 0))),
-            "doc_number": t.get("DocNumber", ""),
-        }
-        for t in qb_txns if t.get("Id") not in matched_qb_ids
-    ]
+    matched_qb_ids = {
+        m["existing"].get("Id")
+        for found in (result["matched"], result["probable"])
+        for m in found
+    }
+
+    outstanding_in_qb = []
+    for t in qb_txns:
+        get = t.get
+        if get("Id") in matched_qb_ids:
+            continue
+        outstanding_in_qb.append({
+            "type": get("_entity_type"),
+            "id": get("Id"),
+            "date": get("TxnDate"),
+            "amount": float(get("TotalAmt", get("Amount", 0))),
+            "doc_number": get("DocNumber", ""),
+        })
 
     report = {
         "statement_file": statement_file,
@@ -207,6 +362,7 @@ def recon_report(
     account_id: Annotated[str, typer.Option("--account-id", help="Bank/CC account ID")],
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date (YYYY-MM-DD)")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date (YYYY-MM-DD)")] = None,
+    refresh: Annotated[bool, typer.Option("--refresh", help="Bypass the local account cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Generate a reconciliation-style report for an account.
@@ -217,8 +373,8 @@ def recon_report(
     fmt = output or _output()
     client = _client()
 
-    # Get account
-    acct = client.get(f"account/{account_id}").get("Account", {})
+    # Get account (shares the cached lookup from 'reconcile start'; writes invalidate it)
+    acct = cache.cached_get(client, f"account/{account_id}", use_cache=not refresh).get("Account", {})
 
     # Use TransactionList report filtered by account
     params: dict = {"account": account_id}
@@ -1,14 +1,18 @@
 """RefundReceipt resource commands."""
 
-import json
 from typing import Annotated, Optional
 
 import typer
 
+from qb._json import loads
+from qb.api.query import select_fields
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks refund receipts.")
 
+_REFUND_COLUMNS = ["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "TxnDate"]
+
 
 def _client():
     from qb.cli import get_client
@@ -28,12 +32,13 @@ def list_refunds(
     """List all refund receipts."""
     fmt = output or _output()
     client = _client()
-    result = client.query("SELECT * FROM RefundReceipt", max_results=limit)
-    refunds = result.get("QueryResponse", {}).get("RefundReceipt", [])
+    # Table/CSV only render _REFUND_COLUMNS, so only fetch those fields
+    select = "*" if fmt == OutputFormat.json else select_fields(_REFUND_COLUMNS)
+    refunds = client.query_paginated(f"SELECT {select} FROM RefundReceipt", "RefundReceipt", limit=limit)
     format_output(
         refunds,
         fmt,
-        columns=["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "TxnDate"],
+        columns=_REFUND_COLUMNS,
     )
 
 
@@ -65,9 +70,9 @@ def create(
     client = _client()
 
     if json_input:
-        body = json.loads(json_input)
+        body = loads(json_input)
     elif line_json:
-        body: dict = {"Line": json.loads(line_json)}
+        body: dict = {"Line": loads(line_json)}
     elif amount is not None:
         body = {
             "Line": [
@@ -83,11 +88,7 @@ def create(
             ],
         }
     else:
-        typer.echo(
-            json.dumps({"error": True, "message": "Provide --amount, --line-json, or --json"}),
-            err=True,
-        )
-        raise SystemExit(5)
+        handle_error_fast("Provide --amount, --line-json, or --json")
 
     if customer_id:
         body["CustomerRef"] = {"value": customer_id}
@@ -103,30 +104,32 @@ def create(
 @app.command()
 def delete(
     refund_id: Annotated[str, typer.Argument(help="RefundReceipt ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Delete a refund receipt."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"refundreceipt/{refund_id}").get("RefundReceipt", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"]}
-    result = client.post("refundreceipt", body, params={"operation": "delete"})
+    result = client.post_with_sync_token(
+        "refundreceipt", "RefundReceipt", refund_id, params={"operation": "delete"}, sync_token=sync_token
+    )
     format_output(result, fmt)
 
 
 @app.command()
 def void(
     refund_id: Annotated[str, typer.Argument(help="RefundReceipt ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Void a refund receipt (zeros amounts, keeps record)."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"refundreceipt/{refund_id}").get("RefundReceipt", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"], "sparse": True}
-    result = client.post("refundreceipt", body, params={"include": "void"})
+    result = client.post_with_sync_token(
+        "refundreceipt", "RefundReceipt", refund_id, {"sparse": True}, params={"include": "void"}, sync_token=sync_token
+    )
     format_output(result.get("RefundReceipt", result), fmt)
 
 
@@ -140,12 +143,13 @@ def query(
     client = _client()
 
     if not sql.upper().startswith("SELECT"):
-        sql = f"SELECT * FROM RefundReceipt WHERE {sql}"
+        select = "*" if fmt == OutputFormat.json else select_fields(_REFUND_COLUMNS)
+        sql = f"SELECT {select} FROM RefundReceipt WHERE {sql}"
 
     result = client.query(sql)
     refunds = result.get("QueryResponse", {}).get("RefundReceipt", [])
     format_output(
         refunds,
         fmt,
-        columns=["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "TxnDate"],
+        columns=_REFUND_COLUMNS,
     )
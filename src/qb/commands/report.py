@@ -4,6 +4,7 @@ from typing import Annotated, Optional
 
 import typer
 
+from qb import cache
 from qb.output import format_report, OutputFormat
 
 app = typer.Typer(help="Run QuickBooks financial reports.")
@@ -23,12 +24,18 @@ def _run_report(
     report_name: str,
     params: dict,
     fmt: OutputFormat,
+    use_cache: bool = True,
 ):
-    """Fetch a report and format output."""
+    """Fetch a report and format output.
+
+    Responses are cached on disk for QB_REPORT_CACHE_TTL seconds (default
+    300, 0 disables); ``use_cache=False`` skips the lookup but still
+    refreshes the stored copy.
+    """
     client = _client()
     # Strip None values
     clean = {k: v for k, v in params.items() if v is not None}
-    result = client.get(f"reports/{report_name}", params=clean)
+    result = cache.cached_report(client, report_name, clean, use_cache=use_cache)
     format_report(result, fmt)
 
 
@@ -41,6 +48,7 @@ def profit_and_loss(
     customer: Annotated[Optional[str], typer.Option("--customer", help="Filter by customer ID")] = None,
     department: Annotated[Optional[str], typer.Option("--department", help="Filter by department ID")] = None,
     date_macro: Annotated[Optional[str], typer.Option("--period", help="Date macro (e.g., 'This Month', 'Last Quarter')")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Profit and Loss (Income Statement)."""
@@ -53,7 +61,7 @@ def profit_and_loss(
         "customer": customer,
         "department": department,
         "date_macro": date_macro,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("profit-and-loss-detail")
@@ -61,6 +69,7 @@ def profit_and_loss_detail(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
     accounting_method: Annotated[Optional[str], typer.Option("--accounting-method", help="Cash or Accrual")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Profit and Loss Detail (transaction-level)."""
@@ -69,7 +78,7 @@ def profit_and_loss_detail(
         "start_date": start_date,
         "end_date": end_date,
         "accounting_method": accounting_method,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("balance-sheet")
@@ -78,6 +87,7 @@ def balance_sheet(
     accounting_method: Annotated[Optional[str], typer.Option("--accounting-method", help="Cash or Accrual")] = None,
     summarize_by: Annotated[Optional[str], typer.Option("--summarize-by", help="Total, Month, Quarter, Year")] = None,
     date_macro: Annotated[Optional[str], typer.Option("--period", help="Date macro")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Balance Sheet."""
@@ -90,7 +100,7 @@ def balance_sheet(
     if date:
         params["start_date"] = date
         params["end_date"] = date
-    _run_report("BalanceSheet", params, fmt)
+    _run_report("BalanceSheet", params, fmt, use_cache=not no_cache)
 
 
 @app.command("cash-flow")
@@ -98,6 +108,7 @@ def cash_flow(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
     summarize_by: Annotated[Optional[str], typer.Option("--summarize-by", help="Total, Month, Quarter, Year")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Statement of Cash Flows."""
@@ -106,13 +117,14 @@ def cash_flow(
         "start_date": start_date,
         "end_date": end_date,
         "summarize_column_by": summarize_by,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("trial-balance")
 def trial_balance(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date (YYYY-MM-DD)")] = None,
     accounting_method: Annotated[Optional[str], typer.Option("--accounting-method", help="Cash or Accrual")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Trial Balance."""
@@ -121,7 +133,7 @@ def trial_balance(
     if date:
         params["start_date"] = date
         params["end_date"] = date
-    _run_report("TrialBalance", params, fmt)
+    _run_report("TrialBalance", params, fmt, use_cache=not no_cache)
 
 
 @app.command("general-ledger")
@@ -130,6 +142,7 @@ def general_ledger(
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
     account: Annotated[Optional[str], typer.Option("--account", help="Filter by account ID")] = None,
     accounting_method: Annotated[Optional[str], typer.Option("--accounting-method", help="Cash or Accrual")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """General Ledger."""
@@ -139,13 +152,14 @@ def general_ledger(
         "end_date": end_date,
         "account": account,
         "accounting_method": accounting_method,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("ar-aging")
 def ar_aging(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
     customer: Annotated[Optional[str], typer.Option("--customer", help="Filter by customer ID")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Accounts Receivable Aging Summary."""
@@ -153,13 +167,14 @@ def ar_aging(
     params: dict = {"customer": customer}
     if date:
         params["report_date"] = date
-    _run_report("AgedReceivables", params, fmt)
+    _run_report("AgedReceivables", params, fmt, use_cache=not no_cache)
 
 
 @app.command("ar-aging-detail")
 def ar_aging_detail(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
     customer: Annotated[Optional[str], typer.Option("--customer", help="Filter by customer ID")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Accounts Receivable Aging Detail."""
@@ -167,13 +182,14 @@ def ar_aging_detail(
     params: dict = {"customer": customer}
     if date:
         params["report_date"] = date
-    _run_report("AgedReceivableDetail", params, fmt)
+    _run_report("AgedReceivableDetail", params, fmt, use_cache=not no_cache)
 
 
 @app.command("ap-aging")
 def ap_aging(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
     vendor: Annotated[Optional[str], typer.Option("--vendor", help="Filter by vendor ID")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Accounts Payable Aging Summary."""
@@ -181,13 +197,14 @@ def ap_aging(
     params: dict = {"vendor": vendor}
     if date:
         params["report_date"] = date
-    _run_report("AgedPayables", params, fmt)
+    _run_report("AgedPayables", params, fmt, use_cache=not no_cache)
 
 
 @app.command("ap-aging-detail")
 def ap_aging_detail(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
     vendor: Annotated[Optional[str], typer.Option("--vendor", help="Filter by vendor ID")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Accounts Payable Aging Detail."""
@@ -195,12 +212,13 @@ def ap_aging_detail(
     params: dict = {"vendor": vendor}
     if date:
         params["report_date"] = date
-    _run_report("AgedPayableDetail", params, fmt)
+    _run_report("AgedPayableDetail", params, fmt, use_cache=not no_cache)
 
 
 @app.command("customer-balance")
 def customer_balance(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Customer Balance Summary."""
@@ -208,12 +226,13 @@ def customer_balance(
     params: dict = {}
     if date:
         params["report_date"] = date
-    _run_report("CustomerBalance", params, fmt)
+    _run_report("CustomerBalance", params, fmt, use_cache=not no_cache)
 
 
 @app.command("vendor-balance")
 def vendor_balance(
     date: Annotated[Optional[str], typer.Option("--date", help="As-of date")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Vendor Balance Summary."""
@@ -221,13 +240,14 @@ def vendor_balance(
     params: dict = {}
     if date:
         params["report_date"] = date
-    _run_report("VendorBalance", params, fmt)
+    _run_report("VendorBalance", params, fmt, use_cache=not no_cache)
 
 
 @app.command("customer-income")
 def customer_income(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Income by Customer."""
@@ -235,13 +255,14 @@ def customer_income(
     _run_report("CustomerIncome", {
         "start_date": start_date,
         "end_date": end_date,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("vendor-expenses")
 def vendor_expenses(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Expenses by Vendor."""
@@ -249,7 +270,7 @@ def vendor_expenses(
     _run_report("VendorExpenses", {
         "start_date": start_date,
         "end_date": end_date,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("transaction-list")
@@ -257,6 +278,7 @@ def transaction_list(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
     transaction_type: Annotated[Optional[str], typer.Option("--transaction-type", help="Filter by type")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Transaction List (flat list of all transactions)."""
@@ -265,13 +287,14 @@ def transaction_list(
         "start_date": start_date,
         "end_date": end_date,
         "transaction_type": transaction_type,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
 
 
 @app.command("tax-summary")
 def tax_summary(
     start_date: Annotated[Optional[str], typer.Option("--start-date", help="Start date")] = None,
     end_date: Annotated[Optional[str], typer.Option("--end-date", help="End date")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the report cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Tax Summary report."""
@@ -279,4 +302,4 @@ def tax_summary(
     _run_report("TaxSummary", {
         "start_date": start_date,
         "end_date": end_date,
-    }, fmt)
+    }, fmt, use_cache=not no_cache)
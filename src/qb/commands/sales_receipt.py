@@ -1,14 +1,17 @@
 """SalesReceipt resource commands."""
 
-import json
 from typing import Annotated, Optional
 
 import typer
 
+from qb._json import loads
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks sales receipts (cash sales).")
 
+_RECEIPT_COLUMNS = ["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "Balance", "TxnDate"]
+
 
 def _client():
     from qb.cli import get_client
@@ -28,12 +31,11 @@ def list_receipts(
     """List all sales receipts."""
     fmt = output or _output()
     client = _client()
-    result = client.query("SELECT * FROM SalesReceipt", max_results=limit)
-    receipts = result.get("QueryResponse", {}).get("SalesReceipt", [])
+    receipts = client.query_paginated("SELECT * FROM SalesReceipt", "SalesReceipt", limit=limit)
     format_output(
         receipts,
         fmt,
-        columns=["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "Balance", "TxnDate"],
+        columns=_RECEIPT_COLUMNS,
     )
 
 
@@ -66,9 +68,9 @@ def create(
     client = _client()
 
     if json_input:
-        body = json.loads(json_input)
+        body = loads(json_input)
     elif line_json:
-        body: dict = {"Line": json.loads(line_json)}
+        body: dict = {"Line": loads(line_json)}
     elif amount is not None:
         body = {
             "Line": [
@@ -84,11 +86,7 @@ def create(
             ],
         }
     else:
-        typer.echo(
-            json.dumps({"error": True, "message": "Provide --amount, --line-json, or --json"}),
-            err=True,
-        )
-        raise SystemExit(5)
+        handle_error_fast("Provide --amount, --line-json, or --json")
 
     if customer_id:
         body["CustomerRef"] = {"value": customer_id}
@@ -106,30 +104,32 @@ def create(
 @app.command()
 def delete(
     receipt_id: Annotated[str, typer.Argument(help="SalesReceipt ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Delete a sales receipt."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"salesreceipt/{receipt_id}").get("SalesReceipt", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"]}
-    result = client.post("salesreceipt", body, params={"operation": "delete"})
+    result = client.post_with_sync_token(
+        "salesreceipt", "SalesReceipt", receipt_id, params={"operation": "delete"}, sync_token=sync_token
+    )
     format_output(result, fmt)
 
 
 @app.command()
 def void(
     receipt_id: Annotated[str, typer.Argument(help="SalesReceipt ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Void a sales receipt (zeros amounts, keeps record)."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"salesreceipt/{receipt_id}").get("SalesReceipt", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"], "sparse": True}
-    result = client.post("salesreceipt", body, params={"include": "void"})
+    result = client.post_with_sync_token(
+        "salesreceipt", "SalesReceipt", receipt_id, {"sparse": True}, params={"include": "void"}, sync_token=sync_token
+    )
     format_output(result.get("SalesReceipt", result), fmt)
 
 
@@ -160,7 +160,7 @@ def query(
     fmt = output or _output()
     client = _client()
 
-    if not sql.upper().startswith("SELECT"):
+    if sql.lstrip()[:6].casefold() != "select":
         sql = f"SELECT * FROM SalesReceipt WHERE {sql}"
 
     result = client.query(sql)
@@ -168,5 +168,5 @@ def query(
     format_output(
         receipts,
         fmt,
-        columns=["Id", "DocNumber", "CustomerRef.name", "TotalAmt", "Balance", "TxnDate"],
+        columns=_RECEIPT_COLUMNS,
     )
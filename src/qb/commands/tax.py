@@ -8,6 +8,9 @@ from qb.output import format_output, format_report, OutputFormat
 
 app = typer.Typer(help="View QuickBooks tax codes and rates.")
 
+_TAXCODE_COLUMNS = ["Id", "Name", "Description", "Taxable", "Active"]
+_TAXRATE_COLUMNS = ["Id", "Name", "RateValue", "AgencyRef.value", "Active"]
+
 
 def _client():
     from qb.cli import get_client
@@ -28,12 +31,11 @@ def codes(
     fmt = output or _output()
     client = _client()
     where = "WHERE Active = true" if active_only else ""
-    result = client.query(f"SELECT * FROM TaxCode {where}", max_results=100)
-    codes = result.get("QueryResponse", {}).get("TaxCode", [])
+    codes = client.query_paginated(f"SELECT * FROM TaxCode {where}", "TaxCode", limit=100)
     format_output(
         codes,
         fmt,
-        columns=["Id", "Name", "Description", "Taxable", "Active"],
+        columns=_TAXCODE_COLUMNS,
     )
 
 
@@ -44,12 +46,11 @@ def rates(
     """List tax rates."""
     fmt = output or _output()
     client = _client()
-    result = client.query("SELECT * FROM TaxRate", max_results=100)
-    rates_list = result.get("QueryResponse", {}).get("TaxRate", [])
+    rates_list = client.query_paginated("SELECT * FROM TaxRate", "TaxRate", limit=100)
     format_output(
         rates_list,
         fmt,
-        columns=["Id", "Name", "RateValue", "AgencyRef.value", "Active"],
+        columns=_TAXRATE_COLUMNS,
     )
 
 
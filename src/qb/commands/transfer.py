@@ -1,14 +1,16 @@
 """Transfer resource commands."""
 
-import json
 from typing import Annotated, Optional
 
 import typer
 
+from qb._json import loads
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks transfers between accounts.")
 
+_TRANSFER_COLUMNS = ["Id", "TxnDate", "FromAccountRef.name", "ToAccountRef.name", "Amount"]
+
 
 def _client():
     from qb.cli import get_client
@@ -28,12 +30,11 @@ def list_transfers(
     """List all transfers."""
     fmt = output or _output()
     client = _client()
-    result = client.query("SELECT * FROM Transfer", max_results=limit)
-    transfers = result.get("QueryResponse", {}).get("Transfer", [])
+    transfers = client.query_paginated("SELECT * FROM Transfer", "Transfer", limit=limit)
     format_output(
         transfers,
         fmt,
-        columns=["Id", "TxnDate", "FromAccountRef.name", "ToAccountRef.name", "Amount"],
+        columns=_TRANSFER_COLUMNS,
     )
 
 
@@ -67,7 +68,7 @@ def create(
     client = _client()
 
     if json_input:
-        body = json.loads(json_input)
+        body = loads(json_input)
     else:
         body = {
             "FromAccountRef": {"value": from_account},
@@ -87,15 +88,16 @@ def create(
 @app.command()
 def delete(
     transfer_id: Annotated[str, typer.Argument(help="Transfer ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Delete a transfer."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"transfer/{transfer_id}").get("Transfer", {})
-    body = {"Id": current["Id"], "SyncToken": current["SyncToken"]}
-    result = client.post("transfer", body, params={"operation": "delete"})
+    result = client.post_with_sync_token(
+        "transfer", "Transfer", transfer_id, params={"operation": "delete"}, sync_token=sync_token
+    )
     format_output(result, fmt)
 
 
@@ -108,7 +110,7 @@ def query(
     fmt = output or _output()
     client = _client()
 
-    if not sql.upper().startswith("SELECT"):
+    if sql.lstrip()[:6].casefold() != "select":
         sql = f"SELECT * FROM Transfer WHERE {sql}"
 
     result = client.query(sql)
@@ -116,5 +118,5 @@ def query(
     format_output(
         transfers,
         fmt,
-        columns=["Id", "TxnDate", "FromAccountRef.name", "ToAccountRef.name", "Amount"],
+        columns=_TRANSFER_COLUMNS,
     )
@@ -1,14 +1,21 @@
 """Vendor resource commands."""
 
-import json
 from typing import Annotated, Optional
 
 import typer
 
+from qb._json import loads
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks vendors.")
 
+_VENDOR_COLUMNS = ["Id", "DisplayName", "CompanyName", "PrimaryEmailAddr.Address", "Balance", "Vendor1099"]
+
+# Fields matched by `vendor search`, one LIKE query each
+_VENDOR_SEARCH_FIELDS = ("DisplayName", "CompanyName", "PrimaryEmailAddr")
+_ACTIVE_SUFFIX = " AND Active = true"
+
 
 def _client():
     from qb.cli import get_client
@@ -30,12 +37,11 @@ def list_vendors(
     fmt = output or _output()
     client = _client()
     where = "WHERE Active = true" if active_only else ""
-    result = client.query(f"SELECT * FROM Vendor {where}", max_results=limit)
-    vendors = result.get("QueryResponse", {}).get("Vendor", [])
+    vendors = client.query_paginated(f"SELECT * FROM Vendor {where}", "Vendor", limit=limit)
     format_output(
         vendors,
         fmt,
-        columns=["Id", "DisplayName", "CompanyName", "PrimaryEmailAddr.Address", "Balance", "Vendor1099"],
+        columns=_VENDOR_COLUMNS,
     )
 
 
@@ -61,30 +67,38 @@ def search(
     fmt = output or _output()
     client = _client()
 
+    from concurrent.futures import ThreadPoolExecutor
+
     from qb.api.query import escape_query_value
 
-    fields = ["DisplayName", "CompanyName", "PrimaryEmailAddr"]
     escaped = escape_query_value(term)
-    seen_ids = set()
-    results = []
+    suffix = "" if include_inactive else _ACTIVE_SUFFIX
+    queries = [
+        f"SELECT * FROM Vendor WHERE {field} LIKE '%{escaped}%'{suffix}"
+        for field in _VENDOR_SEARCH_FIELDS
+    ]
 
-    for field in fields:
-        where = f"{field} LIKE '%{escaped}%'"
-        if not include_inactive:
-            where += " AND Active = true"
+    def _search(sql: str) -> list[dict]:
         try:
-            resp = client.query(f"SELECT * FROM Vendor WHERE {where}")
-            for v in resp.get("QueryResponse", {}).get("Vendor", []):
-                if v["Id"] not in seen_ids:
-                    seen_ids.add(v["Id"])
-                    results.append(v)
+            resp = client.query(sql)
         except Exception:
-            continue
+            return []
+        return resp.get("QueryResponse", {}).get("Vendor", [])
+
+    # One query per field, run concurrently; results keep field order
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        found = list(pool.map(_search, queries))
+
+    # Dedupe by Id; a vendor keeps the position of its first match
+    by_id: dict[str, dict] = {}
+    for vendors in found:
+        by_id.update((v["Id"], v) for v in vendors)
+    results = list(by_id.values())
 
     format_output(
         results,
         fmt,
-        columns=["Id", "DisplayName", "CompanyName", "PrimaryEmailAddr.Address", "Balance", "Vendor1099"],
+        columns=_VENDOR_COLUMNS,
     )
 
 
@@ -105,14 +119,10 @@ def create(
     client = _client()
 
     if json_input:
-        body = json.loads(json_input)
+        body = loads(json_input)
     else:
         if not name:
-            typer.echo(
-                json.dumps({"error": True, "message": "--name is required (or use --json)"}),
-                err=True,
-            )
-            raise SystemExit(5)
+            handle_error_fast("--name is required (or use --json)")
         body: dict = {"DisplayName": name}
         if email:
             body["PrimaryEmailAddr"] = {"Address": email}
@@ -139,24 +149,17 @@ def update(
     phone: Annotated[Optional[str], typer.Option("--phone", help="Phone")] = None,
     is_1099: Annotated[Optional[bool], typer.Option("--1099", help="Track as 1099 vendor")] = None,
     json_input: Annotated[Optional[str], typer.Option("--json", help="Full update JSON")] = None,
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
-    """Update an existing vendor. Auto-fetches SyncToken."""
+    """Update an existing vendor. Fetches the SyncToken only if stale."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"vendor/{vendor_id}").get("Vendor", {})
-
     if json_input:
-        body = json.loads(json_input)
-        body["Id"] = current["Id"]
-        body["SyncToken"] = current["SyncToken"]
+        body = loads(json_input)
     else:
-        body = {
-            "Id": current["Id"],
-            "SyncToken": current["SyncToken"],
-            "sparse": True,
-        }
+        body = {"sparse": True}
         if name:
             body["DisplayName"] = name
         if email:
@@ -166,27 +169,23 @@ def update(
         if is_1099 is not None:
             body["Vendor1099"] = is_1099
 
-    result = client.post("vendor", body)
+    result = client.post_with_sync_token("vendor", "Vendor", vendor_id, body, sync_token=sync_token)
     format_output(result.get("Vendor"), fmt)
 
 
 @app.command()
 def delete(
     vendor_id: Annotated[str, typer.Argument(help="Vendor ID")],
+    sync_token: Annotated[Optional[str], typer.Option("--sync-token", help="SyncToken to send (default 0; looked up only if stale)")] = None,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Deactivate a vendor (soft delete — sets Active=false)."""
     fmt = output or _output()
     client = _client()
 
-    current = client.get(f"vendor/{vendor_id}").get("Vendor", {})
-    body = {
-        "Id": current["Id"],
-        "SyncToken": current["SyncToken"],
-        "Active": False,
-        "sparse": True,
-    }
-    result = client.post("vendor", body)
+    result = client.post_with_sync_token(
+        "vendor", "Vendor", vendor_id, {"Active": False, "sparse": True}, sync_token=sync_token
+    )
     format_output(result.get("Vendor"), fmt)
 
 
@@ -199,7 +198,7 @@ def query(
     fmt = output or _output()
     client = _client()
 
-    if not sql.upper().startswith("SELECT"):
+    if sql.lstrip()[:6].casefold() != "select":
         sql = f"SELECT * FROM Vendor WHERE {sql}"
 
     result = client.query(sql)
@@ -207,5 +206,5 @@ def query(
     format_output(
         vendors,
         fmt,
-        columns=["Id", "DisplayName", "CompanyName", "PrimaryEmailAddr.Address", "Balance", "Vendor1099"],
+        columns=_VENDOR_COLUMNS,
     )
@@ -5,6 +5,7 @@ from typing import Annotated, Optional
 
 import typer
 
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Manage QuickBooks vendor credits.")
@@ -85,11 +86,7 @@ def create(
             ],
         }
     else:
-        typer.echo(
-            json.dumps({"error": True, "message": "Provide --amount, --line-json, or --json"}),
-            err=True,
-        )
-        raise SystemExit(5)
+        handle_error_fast("Provide --amount, --line-json, or --json")
 
     if txn_date:
         body["TxnDate"] = txn_date
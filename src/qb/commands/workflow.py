@@ -1,21 +1,35 @@
 """High-level bookkeeping workflow commands."""
 
 import csv as csv_mod
-import io
+import gzip
 import json
-from datetime import datetime, timedelta
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from operator import itemgetter
 from calendar import monthrange
 from pathlib import Path
 from typing import Annotated, Optional
 
 import typer
 
+from qb import cache
+from qb._json import dumps
+from qb.models.errors import handle_error_fast
 from qb.output import format_output, OutputFormat
 
 app = typer.Typer(help="Bookkeeping workflow automation.")
 
 WORKSPACE = Path("/workspace")
 
+# Shared read-only default for missing nested refs
+_EMPTY: dict = {}
+
+# Only the Payment fields undeposited-funds reads; skips Line detail
+_UF_PAYMENT_SQL = (
+    "SELECT Id, TxnDate, TotalAmt, UnappliedAmt, DepositToAccountRef, CustomerRef, PaymentRefNum FROM Payment"
+)
+
 
 def _client():
     from qb.cli import get_client
@@ -27,10 +41,87 @@ def _output():
     return get_output_format()
 
 
+def _check_undeposited_funds(client, use_cache: bool) -> dict:
+    """Month-close check: Undeposited Funds should be empty."""
+    try:
+        resp = cache.cached_query(client, "SELECT * FROM Account WHERE Name = 'Undeposited Funds'", use_cache=use_cache)
+        uf_accounts = resp.get("QueryResponse", {}).get("Account", [])
+        uf_balance = float(uf_accounts[0].get("CurrentBalance", 0)) if uf_accounts else 0
+        return {
+            "check": "Undeposited Funds",
+            "status": "pass" if abs(uf_balance) < 0.01 else "warning",
+            "balance": uf_balance,
+            "message": "Clear" if abs(uf_balance) < 0.01 else f"${uf_balance:.2f} sitting in Undeposited Funds — group into deposits",
+        }
+    except Exception as e:
+        return {"check": "Undeposited Funds", "status": "error", "message": str(e)}
+
+
+def _check_overdue(client, entity: str, check: str, noun: str, start_date: str, use_cache: bool) -> dict:
+    """Month-close check: open ``entity`` rows (Invoice/Bill) due before the month."""
+    try:
+        resp = cache.cached_query(
+            client, f"SELECT * FROM {entity} WHERE Balance > '0' AND DueDate < '{start_date}'",
+            max_results=500, use_cache=use_cache,
+        )
+        overdue = resp.get("QueryResponse", {}).get(entity, [])
+        overdue_total = sum(float(txn.get("Balance", 0)) for txn in overdue)
+        return {
+            "check": check,
+            "status": "pass" if not overdue else "warning",
+            "count": len(overdue),
+            "total": overdue_total,
+            "message": f"No overdue {noun}" if not overdue else f"{len(overdue)} overdue {noun} totaling ${overdue_total:.2f}",
+        }
+    except Exception as e:
+        return {"check": check, "status": "error", "message": str(e)}
+
+
+def _check_open_invoices(client, start_date: str, end_date: str, use_cache: bool) -> dict:
+    """Month-close check: invoices dated in the month with an outstanding balance."""
+    try:
+        resp = cache.cached_query(
+            client,
+            f"SELECT * FROM Invoice WHERE TxnDate >= '{start_date}' AND TxnDate <= '{end_date}' AND Balance > '0'",
+            max_results=100,
+            use_cache=use_cache,
+        )
+        open_invoices = resp.get("QueryResponse", {}).get("Invoice", [])
+        open_total = sum(float(inv.get("Balance", 0)) for inv in open_invoices)
+        return {
+            "check": "Open Invoices (this month)",
+            "status": "pass" if not open_invoices else "info",
+            "count": len(open_invoices),
+            "total": open_total,
+            "message": "No open invoices" if not open_invoices else f"{len(open_invoices)} open invoices totaling ${open_total:.2f}",
+        }
+    except Exception as e:
+        return {"check": "Open Invoices (this month)", "status": "error", "message": str(e)}
+
+
+def _write_report(
+    client, month: str, report_name: str, params: dict, use_cache: bool, compress: bool = False,
+) -> dict:
+    """Fetch a month-close report and save it to the workspace (gzipped if ``compress``)."""
+    try:
+        data = cache.cached_report(client, report_name, params, use_cache=use_cache)
+        payload = dumps(data, indent=True, default=str)
+        filepath = WORKSPACE / f"{month}_{report_name}.json"
+        if compress:
+            payload = gzip.compress(payload, compresslevel=1)
+            filepath = filepath.with_suffix(".json.gz")
+        filepath.write_bytes(payload)
+        return {"status": "generated", "file": str(filepath)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 @app.command("month-close")
 def month_close(
     month: Annotated[str, typer.Option("--month", help="Month to close (YYYY-MM)")],
     check_only: Annotated[bool, typer.Option("--check-only", help="Only run checks, don't generate report files")] = False,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the local query cache")] = False,
+    compress: Annotated[bool, typer.Option("--compress", help="Write report files gzipped (.json.gz)")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """Guided month-end close checklist.
@@ -55,92 +146,32 @@ def month_close(
         start_date = f"{year}-{mo:02d}-01"
         end_date = f"{year}-{mo:02d}-{last_day:02d}"
     except (ValueError, TypeError):
-        typer.echo(json.dumps({"error": True, "message": "Invalid month format. Use YYYY-MM"}), err=True)
-        raise SystemExit(5)
-
-    checks = []
-
-    # Check 1: Undeposited Funds
-    try:
-        resp = client.query("SELECT * FROM Account WHERE Name = 'Undeposited Funds'")
-        uf_accounts = resp.get("QueryResponse", {}).get("Account", [])
-        uf_balance = float(uf_accounts[0].get("CurrentBalance", 0)) if uf_accounts else 0
-        checks.append({
-            "check": "Undeposited Funds",
-            "status": "pass" if abs(uf_balance) < 0.01 else "warning",
-            "balance": uf_balance,
-            "message": "Clear" if abs(uf_balance) < 0.01 else f"${uf_balance:.2f} sitting in Undeposited Funds — group into deposits",
-        })
-    except Exception as e:
-        checks.append({"check": "Undeposited Funds", "status": "error", "message": str(e)})
-
-    # Check 2: Overdue AR
-    try:
-        resp = client.query(f"SELECT * FROM Invoice WHERE Balance > '0' AND DueDate < '{start_date}'", max_results=500)
-        overdue_invoices = resp.get("QueryResponse", {}).get("Invoice", [])
-        overdue_total = sum(float(inv.get("Balance", 0)) for inv in overdue_invoices)
-        checks.append({
-            "check": "Overdue AR",
-            "status": "pass" if not overdue_invoices else "warning",
-            "count": len(overdue_invoices),
-            "total": overdue_total,
-            "message": "No overdue invoices" if not overdue_invoices else f"{len(overdue_invoices)} overdue invoices totaling ${overdue_total:.2f}",
-        })
-    except Exception as e:
-        checks.append({"check": "Overdue AR", "status": "error", "message": str(e)})
-
-    # Check 3: Overdue AP
-    try:
-        resp = client.query(f"SELECT * FROM Bill WHERE Balance > '0' AND DueDate < '{start_date}'", max_results=500)
-        overdue_bills = resp.get("QueryResponse", {}).get("Bill", [])
-        overdue_bill_total = sum(float(b.get("Balance", 0)) for b in overdue_bills)
-        checks.append({
-            "check": "Overdue AP",
-            "status": "pass" if not overdue_bills else "warning",
-            "count": len(overdue_bills),
-            "total": overdue_bill_total,
-            "message": "No overdue bills" if not overdue_bills else f"{len(overdue_bills)} overdue bills totaling ${overdue_bill_total:.2f}",
-        })
-    except Exception as e:
-        checks.append({"check": "Overdue AP", "status": "error", "message": str(e)})
-
-    # Check 4: Open invoices for the month with outstanding balance
-    try:
-        resp = client.query(
-            f"SELECT * FROM Invoice WHERE TxnDate >= '{start_date}' AND TxnDate <= '{end_date}' AND Balance > '0'",
-            max_results=100,
-        )
-        open_invoices = resp.get("QueryResponse", {}).get("Invoice", [])
-        open_total = sum(float(inv.get("Balance", 0)) for inv in open_invoices)
-        checks.append({
-            "check": "Open Invoices (this month)",
-            "status": "pass" if not open_invoices else "info",
-            "count": len(open_invoices),
-            "total": open_total,
-            "message": "No open invoices" if not open_invoices else f"{len(open_invoices)} open invoices totaling ${open_total:.2f}",
-        })
-    except Exception as e:
-        checks.append({"check": "Open Invoices (this month)", "status": "error", "message": str(e)})
-
-    # Generate reports (unless check-only)
-    reports = {}
-    if not check_only:
-        WORKSPACE.mkdir(parents=True, exist_ok=True)
-
-        for report_name, params in [
-            ("ProfitAndLoss", {"start_date": start_date, "end_date": end_date}),
-            ("BalanceSheet", {"start_date": end_date, "end_date": end_date}),
-            ("TrialBalance", {"start_date": end_date, "end_date": end_date}),
-        ]:
-            try:
-                data = client.get(f"reports/{report_name}", params=params)
-                filename = f"{month}_{report_name}.json"
-                filepath = WORKSPACE / filename
-                with open(filepath, "w") as f:
-                    json.dump(data, f, indent=2, default=str)
-                reports[report_name] = {"status": "generated", "file": str(filepath)}
-            except Exception as e:
-                reports[report_name] = {"status": "error", "message": str(e)}
+        handle_error_fast("Invalid month format. Use YYYY-MM")
+
+    use_cache = not no_cache
+    with ThreadPoolExecutor(max_workers=7) as pool:
+        check_jobs = [
+            pool.submit(_check_undeposited_funds, client, use_cache),
+            pool.submit(_check_overdue, client, "Invoice", "Overdue AR", "invoices", start_date, use_cache),
+            pool.submit(_check_overdue, client, "Bill", "Overdue AP", "bills", start_date, use_cache),
+            pool.submit(_check_open_invoices, client, start_date, end_date, use_cache),
+        ]
+
+        # Generate reports (unless check-only)
+        report_jobs = {}
+        if not check_only:
+            WORKSPACE.mkdir(parents=True, exist_ok=True)
+            for report_name, params in [
+                ("ProfitAndLoss", {"start_date": start_date, "end_date": end_date}),
+                ("BalanceSheet", {"start_date": end_date, "end_date": end_date}),
+                ("TrialBalance", {"start_date": end_date, "end_date": end_date}),
+            ]:
+                report_jobs[report_name] = pool.submit(
+                    _write_report, client, month, report_name, params, use_cache, compress,
+                )
+
+    checks = [job.result() for job in check_jobs]
+    reports = {name: job.result() for name, job in report_jobs.items()}
 
     result = {
         "month": month,
@@ -153,10 +184,27 @@ def month_close(
     format_output(result, fmt)
 
 
+def _totals_by_vendor(client, entity: str, ref_field: str, where: str, use_cache: bool = True) -> dict[str, float]:
+    """Sum TotalAmt per vendor over a paged scan of ``entity``.
+
+    ``ref_field`` names the vendor reference; refs typed as anything other
+    than Vendor (e.g. a Purchase paid to a customer) are skipped. API
+    errors propagate: a partial scan would understate every vendor.
+    """
+    totals: dict[str, float] = defaultdict(float)
+    sql = f"SELECT Id, {ref_field}, TotalAmt FROM {entity} WHERE {where}"
+    for txn in cache.cached_query_paginated(client, sql, entity, use_cache=use_cache):
+        ref = txn.get(ref_field) or _EMPTY
+        if ref.get("type", "Vendor") == "Vendor":
+            totals[ref.get("value")] += float(txn.get("TotalAmt", 0))
+    return totals
+
+
 @app.command("1099-prep")
 def prep_1099(
     year: Annotated[str, typer.Option("--year", help="Tax year (YYYY)")],
     threshold: Annotated[float, typer.Option("--threshold", help="Filing threshold")] = 600.0,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the local query cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """1099 filing preparation.
@@ -171,38 +219,21 @@ def prep_1099(
     end_date = f"{year}-12-31"
 
     # Get all 1099 vendors (Vendor1099 not queryable — fetch all and filter client-side)
-    resp = client.query("SELECT * FROM Vendor", max_results=500)
-    all_vendors = resp.get("QueryResponse", {}).get("Vendor", [])
+    all_vendors = cache.cached_query_paginated(client, "SELECT * FROM Vendor", "Vendor", use_cache=not no_cache)
     vendors_1099 = [v for v in all_vendors if v.get("Vendor1099") is True]
 
+    # Two paged scans for the whole year, totalled per vendor client-side
+    date_range = f"TxnDate >= '{start_date}' AND TxnDate <= '{end_date}'"
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        bp_job = pool.submit(_totals_by_vendor, client, "BillPayment", "VendorRef", date_range, not no_cache)
+        purchase_job = pool.submit(_totals_by_vendor, client, "Purchase", "EntityRef", date_range, not no_cache)
+    bp_totals, purchase_totals = bp_job.result(), purchase_job.result()
+
     vendor_data = []
     for v in vendors_1099:
         vid = v["Id"]
         vname = v.get("DisplayName", "")
-
-        # Sum payments to this vendor
-        total_paid = 0.0
-        try:
-            # BillPayments
-            bp_resp = client.query(
-                f"SELECT * FROM BillPayment WHERE VendorRef = '{vid}' AND TxnDate >= '{start_date}' AND TxnDate <= '{end_date}'",
-                max_results=500,
-            )
-            for bp in bp_resp.get("QueryResponse", {}).get("BillPayment", []):
-                total_paid += float(bp.get("TotalAmt", 0))
-        except Exception:
-            pass
-
-        try:
-            # Direct purchases/checks to this vendor
-            p_resp = client.query(
-                f"SELECT * FROM Purchase WHERE EntityRef = '{vid}' AND TxnDate >= '{start_date}' AND TxnDate <= '{end_date}'",
-                max_results=500,
-            )
-            for p in p_resp.get("QueryResponse", {}).get("Purchase", []):
-                total_paid += float(p.get("TotalAmt", 0))
-        except Exception:
-            pass
+        total_paid = bp_totals.get(vid, 0.0) + purchase_totals.get(vid, 0.0)
 
         has_tin = bool(v.get("TaxIdentifier"))
 
@@ -210,7 +241,7 @@ def prep_1099(
             "vendor_id": vid,
             "vendor_name": vname,
             "company": v.get("CompanyName", ""),
-            "email": (v.get("PrimaryEmailAddr") or {}).get("Address", ""),
+            "email": (v.get("PrimaryEmailAddr") or _EMPTY).get("Address", ""),
             "has_tin": has_tin,
             "tin_status": "on_file" if has_tin else "MISSING",
             "total_paid": round(total_paid, 2),
@@ -238,76 +269,84 @@ def prep_1099(
     # Export CSV to workspace
     WORKSPACE.mkdir(parents=True, exist_ok=True)
     csv_path = WORKSPACE / f"1099_prep_{year}.csv"
-    buf = io.StringIO()
-    writer = csv_mod.DictWriter(buf, fieldnames=["vendor_id", "vendor_name", "company", "email", "has_tin", "total_paid", "requires_1099"])
-    writer.writeheader()
-    for v in vendor_data:
-        writer.writerow({k: v[k] for k in writer.fieldnames})
-    with open(csv_path, "w") as f:
-        f.write(buf.getvalue())
+    fieldnames = ("vendor_id", "vendor_name", "company", "email", "has_tin", "total_paid", "requires_1099")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv_mod.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(map(itemgetter(*fieldnames), vendor_data))
     result["csv_export"] = str(csv_path)
 
     format_output(result, fmt)
 
 
+def _days_since(today: date, iso_date: Optional[str]) -> int:
+    """Whole days from a YYYY-MM-DD date to ``today`` (0 if unparseable)."""
+    try:
+        return (today - date.fromisoformat(iso_date)).days
+    except (ValueError, TypeError):
+        return 0
+
+
 @app.command("ar-followup")
 def ar_followup(
     days_overdue: Annotated[int, typer.Option("--days-overdue", help="Minimum days overdue")] = 30,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the local query cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """List overdue invoices grouped by customer for AR follow-up."""
     fmt = output or _output()
     client = _client()
 
-    cutoff = (datetime.now() - timedelta(days=days_overdue)).strftime("%Y-%m-%d")
+    today = date.today()
+    cutoff = (today - timedelta(days=days_overdue)).isoformat()
 
-    resp = client.query(
+    overdue = cache.cached_query_paginated(
+        client,
         f"SELECT * FROM Invoice WHERE Balance > '0' AND DueDate < '{cutoff}'",
-        max_results=500,
+        "Invoice",
+        use_cache=not no_cache,
     )
-    overdue = resp.get("QueryResponse", {}).get("Invoice", [])
 
     # Group by customer
-    by_customer: dict = {}
+    by_customer: dict = defaultdict(
+        lambda: {"customer_id": "", "customer_name": "", "invoices": [], "total_overdue": 0.0}
+    )
     for inv in overdue:
-        cust_name = inv.get("CustomerRef", {}).get("name", "Unknown")
-        cust_id = inv.get("CustomerRef", {}).get("value", "")
-        key = cust_id or cust_name
-
-        if key not in by_customer:
-            by_customer[key] = {
-                "customer_id": cust_id,
-                "customer_name": cust_name,
-                "invoices": [],
-                "total_overdue": 0.0,
-            }
+        cust_ref = inv.get("CustomerRef") or _EMPTY
+        cust_name = cust_ref.get("name", "Unknown")
+        cust_id = cust_ref.get("value", "")
+        entry = by_customer[cust_id or cust_name]
+        if not entry["invoices"]:
+            entry["customer_id"] = cust_id
+            entry["customer_name"] = cust_name
 
         due_date = inv.get("DueDate", "")
-        try:
-            days = (datetime.now() - datetime.strptime(due_date, "%Y-%m-%d")).days
-        except (ValueError, TypeError):
-            days = 0
+        days = _days_since(today, due_date)
 
-        by_customer[key]["invoices"].append({
+        bal = float(inv.get("Balance", 0))
+        entry["invoices"].append({
             "invoice_id": inv["Id"],
             "doc_number": inv.get("DocNumber", ""),
             "amount": float(inv.get("TotalAmt", 0)),
-            "balance": float(inv.get("Balance", 0)),
+            "balance": bal,
             "due_date": due_date,
             "days_overdue": days,
         })
-        by_customer[key]["total_overdue"] += float(inv.get("Balance", 0))
+        entry["total_overdue"] += bal
 
-    customers = sorted(by_customer.values(), key=lambda x: x["total_overdue"], reverse=True)
+    customers = sorted(by_customer.values(), key=itemgetter("total_overdue"), reverse=True)
+    total_overdue = total_invoices = 0
     for c in customers:
         c["total_overdue"] = round(c["total_overdue"], 2)
         c["invoice_count"] = len(c["invoices"])
+        total_overdue += c["total_overdue"]
+        total_invoices += c["invoice_count"]
 
     result = {
         "min_days_overdue": days_overdue,
         "customers_with_overdue": len(customers),
-        "total_overdue": round(sum(c["total_overdue"] for c in customers), 2),
-        "total_invoices": sum(c["invoice_count"] for c in customers),
+        "total_overdue": round(total_overdue, 2),
+        "total_invoices": total_invoices,
         "customers": customers,
     }
 
@@ -316,6 +355,7 @@ def ar_followup(
 
 @app.command("undeposited-funds")
 def undeposited_funds(
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the local query cache")] = False,
     output: Annotated[Optional[OutputFormat], typer.Option("-o")] = None,
 ):
     """List payments sitting in Undeposited Funds."""
@@ -323,31 +363,34 @@ def undeposited_funds(
     client = _client()
 
     # Find Undeposited Funds account
-    resp = client.query("SELECT * FROM Account WHERE Name = 'Undeposited Funds'")
+    resp = cache.cached_query(client, "SELECT * FROM Account WHERE Name = 'Undeposited Funds'", use_cache=not no_cache)
     uf_accounts = resp.get("QueryResponse", {}).get("Account", [])
     if not uf_accounts:
         typer.echo(json.dumps({"status": "ok", "message": "Undeposited Funds account not found or empty"}))
         return
 
     uf_balance = float(uf_accounts[0].get("CurrentBalance", 0))
+    uf_id = uf_accounts[0].get("Id")
 
     # Query payments that went to Undeposited Funds (those without DepositToAccountRef or with UF)
     payments = []
     try:
-        resp = client.query("SELECT * FROM Payment", max_results=500)
+        resp = cache.cached_query(client, _UF_PAYMENT_SQL, max_results=500, use_cache=not no_cache)
+        today = date.today()
         for p in resp.get("QueryResponse", {}).get("Payment", []):
             unapplied = float(p.get("UnappliedAmt", 0))
-            deposit_to = p.get("DepositToAccountRef", {}).get("name", "")
-            if "undeposited" in deposit_to.lower() or (not deposit_to and unapplied > 0):
-                age_days = 0
-                try:
-                    age_days = (datetime.now() - datetime.strptime(p["TxnDate"], "%Y-%m-%d")).days
-                except (ValueError, TypeError):
-                    pass
+            deposit_ref = p.get("DepositToAccountRef") or _EMPTY
+            deposit_to = deposit_ref.get("name", "")
+            if (
+                (uf_id and deposit_ref.get("value") == uf_id)
+                or "undeposited" in deposit_to.lower()
+                or (not deposit_to and unapplied > 0)
+            ):
+                age_days = _days_since(today, p["TxnDate"])
                 payments.append({
                     "payment_id": p["Id"],
                     "date": p.get("TxnDate"),
-                    "customer": p.get("CustomerRef", {}).get("name", ""),
+                    "customer": (p.get("CustomerRef") or _EMPTY).get("name", ""),
                     "amount": float(p.get("TotalAmt", 0)),
                     "ref": p.get("PaymentRefNum", ""),
                     "age_days": age_days,
@@ -1,10 +1,12 @@
 """Configuration file management."""
 
-import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from qb._json import dumps, loads
+
 DEFAULT_CONFIG_DIR = Path.home() / ".qb"
 
 
@@ -18,17 +20,21 @@ def get_config_dir(override: Optional[Path] = None) -> Path:
     return DEFAULT_CONFIG_DIR
 
 
+@lru_cache(maxsize=4)
+def _read_config_file(config_path: Path) -> dict:
+    """Parsed config.json ({} if absent); cached until save_config."""
+    if not config_path.exists():
+        return {}
+    return loads(config_path.read_bytes())
+
+
 def load_config(config_dir: Optional[Path] = None) -> dict:
     """Load config from config.json and environment variables.
 
     Precedence: environment variables > config.json > defaults.
     """
     d = get_config_dir(config_dir)
-    config_path = d / "config.json"
-
-    config = {}
-    if config_path.exists():
-        config = json.loads(config_path.read_text())
+    config = _read_config_file(d / "config.json")
 
     # Env vars override config file values
     return {
@@ -43,6 +49,7 @@ def save_config(config: dict, config_dir: Optional[Path] = None) -> Path:
     d = get_config_dir(config_dir)
     d.mkdir(parents=True, exist_ok=True)
     config_path = d / "config.json"
-    config_path.write_text(json.dumps(config, indent=2))
+    config_path.write_bytes(dumps(config, indent=True))
+    _read_config_file.cache_clear()
     config_path.chmod(0o600)
     return config_path
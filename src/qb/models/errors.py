@@ -7,6 +7,8 @@ from typing import NoReturn
 
 import typer
 
+from qb._json import dumps
+
 
 class ExitCode(IntEnum):
     SUCCESS = 0
@@ -39,3 +41,12 @@ def handle_error(
 
     typer.echo(json.dumps(error_obj, indent=2), err=True)
     raise SystemExit(code.value)
+
+
+_VALIDATION_PREFIX = b'{"error":true,"code":%d,"message":' % ExitCode.VALIDATION_ERROR
+
+
+def handle_error_fast(message: str) -> NoReturn:
+    """Write a compact validation error (message only) to stderr and exit 5."""
+    sys.stderr.buffer.write(_VALIDATION_PREFIX + dumps(message) + b"}\n")
+    raise SystemExit(ExitCode.VALIDATION_ERROR.value)
@@ -1,15 +1,28 @@
 """Output formatting for CLI results."""
 
 import csv
-import io
-import json
+import sys
 from enum import Enum
-from typing import Any, Optional
+from operator import methodcaller
+from typing import Any, Callable, Optional
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from qb._json import dumps
+
+
+_console: Optional[Console] = None
+
+
+def _get_console() -> Console:
+    """Shared rich Console, created on first use."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
+
 
 class OutputFormat(str, Enum):
     json = "json"
@@ -22,34 +35,48 @@ def format_output(
     fmt: OutputFormat = OutputFormat.json,
     columns: Optional[list[str]] = None,
 ) -> None:
-    """Format and print data in the requested format."""
+    """Format and print data in the requested format.
+
+    ``data`` may also be any iterable of rows (e.g. a paginated query);
+    CSV output is then written as rows arrive.
+    """
     if data is None:
         typer.echo("{}")
         return
 
+    if not isinstance(data, (list, dict)) and fmt != OutputFormat.csv:
+        data = list(data)
+
     if fmt == OutputFormat.json:
-        typer.echo(json.dumps(data, indent=2, default=str))
+        typer.echo(dumps(data, indent=True, default=str).decode())
     elif fmt == OutputFormat.table:
         _print_table(data, columns)
     elif fmt == OutputFormat.csv:
         _print_csv(data, columns)
 
 
-def _resolve_nested(obj: dict, key: str) -> Any:
-    """Resolve dotted key path like 'PrimaryEmailAddr.Address'."""
+def _compile_accessor(key: str) -> Callable[[dict], Any]:
+    """Build a row getter for a dotted key path like 'PrimaryEmailAddr.Address'.
+
+    Missing keys (or a non-dict along the path) resolve to "".
+    """
+    if "." not in key:
+        return methodcaller("get", key, "")
     parts = key.split(".")
-    current = obj
-    for part in parts:
-        if isinstance(current, dict):
-            current = current.get(part, "")
-        else:
-            return ""
-    return current
+
+    def resolve(obj: Any) -> Any:
+        for part in parts:
+            if not isinstance(obj, dict):
+                return ""
+            obj = obj.get(part, "")
+        return obj
+
+    return resolve
 
 
 def _print_table(data: Any, columns: Optional[list[str]] = None) -> None:
     """Print data as a rich table."""
-    console = Console()
+    console = _get_console()
     if isinstance(data, list):
         if not data:
             typer.echo("(no results)")
@@ -58,8 +85,9 @@ def _print_table(data: Any, columns: Optional[list[str]] = None) -> None:
         table = Table()
         for col in cols:
             table.add_column(col.split(".")[-1])
+        accessors = [_compile_accessor(c) for c in cols]
         for row in data:
-            table.add_row(*[str(_resolve_nested(row, c)) for c in cols])
+            table.add_row(*[str(get(row)) for get in accessors])
         console.print(table)
     elif isinstance(data, dict):
         table = Table(show_header=False)
@@ -67,38 +95,37 @@ def _print_table(data: Any, columns: Optional[list[str]] = None) -> None:
         table.add_column("Value")
         for k, v in data.items():
             if isinstance(v, (dict, list)):
-                table.add_row(str(k), json.dumps(v, default=str))
+                table.add_row(str(k), dumps(v, default=str).decode())
             else:
                 table.add_row(str(k), str(v))
         console.print(table)
 
 
 def _print_csv(data: Any, columns: Optional[list[str]] = None) -> None:
-    """Print data as CSV."""
-    if isinstance(data, list):
-        if not data:
-            return
-        cols = columns or list(data[0].keys())
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=cols, extrasaction="ignore")
-        writer.writeheader()
-        for row in data:
-            flat = {c: _resolve_nested(row, c) for c in cols}
-            writer.writerow(flat)
-        typer.echo(output.getvalue().strip())
-    elif isinstance(data, dict):
+    """Print data as CSV, streaming rows when given a list or iterable."""
+    if isinstance(data, dict):
         cols = columns or list(data.keys())
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=cols, extrasaction="ignore")
+        writer = csv.DictWriter(sys.stdout, fieldnames=cols, extrasaction="ignore", lineterminator="\n")
         writer.writeheader()
         writer.writerow(data)
-        typer.echo(output.getvalue().strip())
+        return
+
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return
+    cols = columns or list(first.keys())
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(cols)
+    accessors = [_compile_accessor(c) for c in cols]
+    writer.writerow([get(first) for get in accessors])
+    writer.writerows([get(row) for get in accessors] for row in rows)
 
 
 def format_report(data: dict, fmt: OutputFormat = OutputFormat.json) -> None:
     """Format and print a QB report response."""
     if fmt == OutputFormat.json:
-        typer.echo(json.dumps(data, indent=2, default=str))
+        typer.echo(dumps(data, indent=True, default=str).decode())
     elif fmt == OutputFormat.table:
         _print_report_table(data)
     elif fmt == OutputFormat.csv:
@@ -106,37 +133,43 @@ def format_report(data: dict, fmt: OutputFormat = OutputFormat.json) -> None:
 
 
 def _extract_report_rows(rows: list, depth: int = 0) -> list[dict]:
-    """Recursively extract report rows into flat list with indent depth."""
+    """Flatten nested report rows (depth-first) into a list with indent depth.
+
+    Walks an explicit stack rather than recursing. A section's summary is
+    pushed as a finished entry beneath its children so it is emitted after
+    them.
+    """
     result = []
-    for row in rows:
+    append = result.append
+    stack: list = [(row, depth) for row in reversed(rows)]
+    push, pop = stack.append, stack.pop
+    while stack:
+        row, d = pop()
+        if d is None:
+            append(row)
+            continue
         row_type = row.get("type", "")
-        if row_type == "Section":
-            header = row.get("Header", {})
-            if header.get("ColData"):
-                result.append({"depth": depth, "cols": header["ColData"], "style": "header"})
-            for sub in row.get("Rows", {}).get("Row", []):
-                result.extend(_extract_report_rows([sub], depth + 1))
-            summary = row.get("Summary", {})
-            if summary.get("ColData"):
-                result.append({"depth": depth, "cols": summary["ColData"], "style": "summary"})
-        elif row_type == "Data":
-            if row.get("ColData"):
-                result.append({"depth": depth, "cols": row["ColData"], "style": "data"})
-        else:
-            if row.get("ColData"):
-                result.append({"depth": depth, "cols": row["ColData"], "style": "data"})
-            if row.get("Header", {}).get("ColData"):
-                result.append({"depth": depth, "cols": row["Header"]["ColData"], "style": "header"})
-            for sub in row.get("Rows", {}).get("Row", []):
-                result.extend(_extract_report_rows([sub], depth + 1))
-            if row.get("Summary", {}).get("ColData"):
-                result.append({"depth": depth, "cols": row["Summary"]["ColData"], "style": "summary"})
+        if row_type != "Section":
+            cols = row.get("ColData")
+            if cols:
+                append({"depth": d, "cols": cols, "style": "data"})
+            if row_type == "Data":
+                continue
+        cols = row.get("Header", {}).get("ColData")
+        if cols:
+            append({"depth": d, "cols": cols, "style": "header"})
+        cols = row.get("Summary", {}).get("ColData")
+        if cols:
+            push(({"depth": d, "cols": cols, "style": "summary"}, None))
+        subs = row.get("Rows", {}).get("Row", [])
+        for sub in reversed(subs):
+            push((sub, d + 1))
     return result
 
 
 def _print_report_table(data: dict) -> None:
     """Print a QB report as a rich table with indentation."""
-    console = Console()
+    console = _get_console()
     header = data.get("Header", {})
     report_name = header.get("ReportName", "Report")
     period = header.get("DateMacro", header.get("StartPeriod", ""))
@@ -185,11 +218,6 @@ def _print_report_csv(data: dict) -> None:
     report_rows = data.get("Rows", {}).get("Row", [])
     flat = _extract_report_rows(report_rows)
 
-    output = io.StringIO()
-    writer = csv.writer(output)
+    writer = csv.writer(sys.stdout, lineterminator="\n")
     writer.writerow(col_names)
-    for row in flat:
-        cols = row["cols"]
-        values = [c.get("value", "") for c in cols]
-        writer.writerow(values)
-    typer.echo(output.getvalue().strip())
+    writer.writerows([c.get("value", "") for c in row["cols"]] for row in flat)
@@ -0,0 +1,50 @@
+"""Shared fixtures: a QBClient wired to an in-process stub transport."""
+
+import json
+from typing import Callable
+
+import httpx
+import pytest
+
+from qb.api.client import QBClient
+from qb.auth.tokens import TokenManager
+
+
+class StubApi:
+    """Records requests and answers them with ``handler(request) -> Response``."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.handler: Callable[[httpx.Request], httpx.Response] = lambda request: httpx.Response(200, json={})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.handler(request)
+
+    def bodies(self) -> list:
+        return [json.loads(r.content) if r.content else None for r in self.requests]
+
+    def queries(self) -> list[str]:
+        return [r.url.params.get("query") for r in self.requests]
+
+
+@pytest.fixture
+def stub_api() -> StubApi:
+    return StubApi()
+
+
+@pytest.fixture
+def client(tmp_path, stub_api, monkeypatch) -> QBClient:
+    for var in ("QB_QUERY_CACHE_TTL", "QB_REPORT_CACHE_TTL"):
+        monkeypatch.delenv(var, raising=False)
+    tokens = TokenManager(tmp_path)
+    tokens.save_tokens(
+        {"access_token": "access", "refresh_token": "refresh", "expires_in": 3600},
+        realm_id="123",
+        environment="sandbox",
+    )
+    qb = QBClient(tokens, client_id="id", client_secret="secret")
+    qb._http = httpx.Client(transport=httpx.MockTransport(stub_api))
+    yield qb
+    qb.close()
+
@@ -0,0 +1,81 @@
+"""On-disk response cache: TTL, write invalidation and file permissions."""
+
+import os
+import stat
+import time
+
+import httpx
+
+from qb import cache
+
+
+def test_put_get_round_trip(client):
+    cache.put(client, "query", "k", {"a": [1, 2]})
+    assert cache.get(client, "query", "k", ttl=60) == {"a": [1, 2]}
+
+
+def test_expired_entry_is_a_miss(client):
+    cache.put(client, "query", "k", {"a": 1})
+    path = next(cache.cache_dir(client).iterdir())
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert cache.get(client, "query", "k", ttl=60) is None
+
+
+def test_zero_ttl_disables_lookup(client):
+    cache.put(client, "query", "k", {"a": 1})
+    assert cache.get(client, "query", "k", ttl=0) is None
+
+
+def test_entries_are_keyed_by_namespace_and_key(client):
+    cache.put(client, "query", "k", {"a": 1})
+    assert cache.get(client, "report", "k", ttl=60) is None
+    assert cache.get(client, "query", "other", ttl=60) is None
+
+
+def test_cache_files_are_owner_only(client):
+    cache.put(client, "query", "k", {"a": 1})
+    directory = cache.cache_dir(client)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+    for entry in directory.iterdir():
+        assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+        assert entry.suffix == ".json"
+
+
+def test_cached_query_hits_network_once(client, stub_api):
+    stub_api.handler = lambda request: httpx.Response(200, json={"QueryResponse": {"Vendor": [{"Id": "1"}]}})
+    first = cache.cached_query(client, "SELECT * FROM Vendor")
+    second = cache.cached_query(client, "SELECT * FROM Vendor")
+    assert first == second
+    assert len(stub_api.requests) == 1
+
+
+def test_use_cache_false_refetches(client, stub_api):
+    stub_api.handler = lambda request: httpx.Response(200, json={"QueryResponse": {}})
+    cache.cached_query(client, "SELECT * FROM Vendor")
+    cache.cached_query(client, "SELECT * FROM Vendor", use_cache=False)
+    assert len(stub_api.requests) == 2
+
+
+def test_env_ttl_zero_skips_cache(client, stub_api, monkeypatch):
+    monkeypatch.setenv("QB_QUERY_CACHE_TTL", "0")
+    stub_api.handler = lambda request: httpx.Response(200, json={"QueryResponse": {}})
+    cache.cached_query(client, "SELECT * FROM Vendor")
+    cache.cached_query(client, "SELECT * FROM Vendor")
+    assert len(stub_api.requests) == 2
+    assert not cache.cache_dir(client).exists()
+
+
+def test_post_invalidates_cache(client, stub_api):
+    stub_api.handler = lambda request: httpx.Response(200, json={"Account": {"Id": "35", "CurrentBalance": 10}})
+    cache.cached_get(client, "account/35")
+    client.post("deposit", {"Line": []})
+    cache.cached_get(client, "account/35")
+    assert [r.method for r in stub_api.requests] == ["GET", "POST", "GET"]
+
+
+def test_cached_report_key_ignores_param_order(client, stub_api):
+    stub_api.handler = lambda request: httpx.Response(200, json={"Header": {}})
+    cache.cached_report(client, "ProfitAndLoss", {"start_date": "2026-01-01", "end_date": "2026-01-31"})
+    cache.cached_report(client, "ProfitAndLoss", {"end_date": "2026-01-31", "start_date": "2026-01-01"})
+    assert len(stub_api.requests) == 1
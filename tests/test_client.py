@@ -0,0 +1,120 @@
+"""QBClient batching, pagination and SyncToken retry against a stub transport."""
+
+import json
+import re
+
+import httpx
+import pytest
+
+from qb import cache
+from qb.api.client import BATCH_MAX_ITEMS, QBApiError
+
+
+def fault(code: str, message: str = "error", status: int = 400) -> httpx.Response:
+    """A QuickBooks-style fault response."""
+    return httpx.Response(
+        status, json={"Fault": {"Error": [{"Message": message, "code": code}], "type": "ValidationFault"}}
+    )
+
+
+def _batch_echo(request: httpx.Request) -> httpx.Response:
+    items = json.loads(request.content)["BatchItemRequest"]
+    return httpx.Response(200, json={"BatchItemResponse": [{"bId": item["bId"]} for item in items]})
+
+
+def test_batch_chunks_to_item_limit(client, stub_api):
+    stub_api.handler = _batch_echo
+    items = [{"bId": str(i), "operation": "create", "Bill": {}} for i in range(BATCH_MAX_ITEMS + 1)]
+    responses = client.batch(items)
+    sizes = [len(body["BatchItemRequest"]) for body in stub_api.bodies()]
+    assert sizes == [BATCH_MAX_ITEMS, 1]
+    assert [r["bId"] for r in responses] == [str(i) for i in range(BATCH_MAX_ITEMS + 1)]
+
+
+def test_query_only_batch_keeps_cache(client, stub_api):
+    stub_api.handler = _batch_echo
+    cache.put(client, "query", "k", {"a": 1})
+    client.batch([{"bId": "1", "Query": "SELECT * FROM Vendor"}])
+    assert cache.get(client, "query", "k", ttl=60) == {"a": 1}
+
+
+def test_mutating_batch_clears_cache(client, stub_api):
+    stub_api.handler = _batch_echo
+    cache.put(client, "query", "k", {"a": 1})
+    client.batch([{"bId": "1", "Query": "SELECT * FROM Vendor"}, {"bId": "2", "operation": "create", "Bill": {}}])
+    assert cache.get(client, "query", "k", ttl=60) is None
+
+
+def _paged(total: int):
+    rows = [{"Id": str(i)} for i in range(1, total + 1)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"]
+        start = int(re.search(r"STARTPOSITION (\d+)", query).group(1))
+        size = int(re.search(r"MAXRESULTS (\d+)", query).group(1))
+        return httpx.Response(200, json={"QueryResponse": {"Vendor": rows[start - 1:start - 1 + size]}})
+
+    return handler
+
+
+def test_query_paginated_stops_after_short_page(client, stub_api):
+    stub_api.handler = _paged(25)
+    rows = list(client.query_paginated("SELECT * FROM Vendor", "Vendor", page_size=10))
+    assert [r["Id"] for r in rows] == [str(i) for i in range(1, 26)]
+    assert stub_api.queries() == [
+        "SELECT * FROM Vendor STARTPOSITION 1 MAXRESULTS 10",
+        "SELECT * FROM Vendor STARTPOSITION 11 MAXRESULTS 10",
+        "SELECT * FROM Vendor STARTPOSITION 21 MAXRESULTS 10",
+    ]
+
+
+def test_query_paginated_exact_multiple_needs_one_empty_page(client, stub_api):
+    stub_api.handler = _paged(20)
+    rows = list(client.query_paginated("SELECT * FROM Vendor", "Vendor", page_size=10))
+    assert len(rows) == 20
+    assert len(stub_api.requests) == 3
+
+
+def test_query_paginated_respects_limit(client, stub_api):
+    stub_api.handler = _paged(100)
+    rows = list(client.query_paginated("SELECT * FROM Vendor", "Vendor", page_size=10, limit=15))
+    assert len(rows) == 15
+    assert stub_api.queries()[-1] == "SELECT * FROM Vendor STARTPOSITION 11 MAXRESULTS 5"
+
+
+def test_query_paginated_caps_page_size(client, stub_api):
+    stub_api.handler = _paged(3)
+    list(client.query_paginated("SELECT * FROM Vendor", "Vendor", page_size=5000))
+    assert stub_api.queries() == ["SELECT * FROM Vendor STARTPOSITION 1 MAXRESULTS 1000"]
+
+
+def test_post_with_sync_token_speculates_zero(client, stub_api):
+    stub_api.handler = lambda request: httpx.Response(200, json={"Vendor": {"Id": "7"}})
+    client.post_with_sync_token("vendor", "Vendor", "7", {"sparse": True})
+    assert [r.method for r in stub_api.requests] == ["POST"]
+    assert stub_api.bodies()[0] == {"sparse": True, "Id": "7", "SyncToken": "0"}
+
+
+def test_post_with_sync_token_retries_stale_object(client, stub_api):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"Vendor": {"Id": "7", "SyncToken": "4"}})
+        if json.loads(request.content)["SyncToken"] == "0":
+            return fault("5010", "Stale Object Error")
+        return httpx.Response(200, json={"Vendor": {"Id": "7", "SyncToken": "5"}})
+
+    stub_api.handler = handler
+    result = client.post_with_sync_token("vendor", "Vendor", "7", {"sparse": True})
+    assert result == {"Vendor": {"Id": "7", "SyncToken": "5"}}
+    assert [(r.method, r.url.path.rsplit("/", 1)[-1]) for r in stub_api.requests] == [
+        ("POST", "vendor"), ("GET", "7"), ("POST", "vendor"),
+    ]
+    assert stub_api.bodies()[2]["SyncToken"] == "4"
+
+
+def test_post_with_sync_token_raises_other_faults(client, stub_api):
+    stub_api.handler = lambda request: fault("6000", "Business Validation Error")
+    with pytest.raises(QBApiError) as excinfo:
+        client.post_with_sync_token("vendor", "Vendor", "7", sync_token="2")
+    assert excinfo.value.code == "6000"
+    assert [r.method for r in stub_api.requests] == ["POST"]
@@ -0,0 +1,33 @@
+"""CSV output formatting."""
+
+from qb.output import OutputFormat, format_output, format_report
+
+
+def test_csv_rows_use_newline_endings(capsys):
+    format_output([{"Id": "1", "Name": "A, Inc"}, {"Id": "2", "Name": "B"}], OutputFormat.csv)
+    assert capsys.readouterr().out == 'Id,Name\n1,"A, Inc"\n2,B\n'
+
+
+def test_csv_nested_columns_default_to_empty(capsys):
+    rows = [{"Id": "1", "PrimaryEmailAddr": {"Address": "a@b"}}, {"Id": "2", "PrimaryEmailAddr": None}]
+    format_output(rows, OutputFormat.csv, columns=["Id", "PrimaryEmailAddr.Address", "Missing"])
+    assert capsys.readouterr().out == "Id,PrimaryEmailAddr.Address,Missing\n1,a@b,\n2,,\n"
+
+
+def test_csv_single_record(capsys):
+    format_output({"Id": "1", "Name": "A"}, OutputFormat.csv)
+    assert capsys.readouterr().out == "Id,Name\n1,A\n"
+
+
+def test_report_csv_flattens_sections(capsys):
+    report = {
+        "Columns": {"Column": [{"ColTitle": ""}, {"ColTitle": "Total"}]},
+        "Rows": {"Row": [{
+            "type": "Section",
+            "Header": {"ColData": [{"value": "Income"}, {"value": ""}]},
+            "Rows": {"Row": [{"type": "Data", "ColData": [{"value": "Sales"}, {"value": "5.00"}]}]},
+            "Summary": {"ColData": [{"value": "Total Income"}, {"value": "5.00"}]},
+        }]},
+    }
+    format_report(report, OutputFormat.csv)
+    assert capsys.readouterr().out == "Account,Total\nIncome,\nSales,5.00\nTotal Income,5.00\n"